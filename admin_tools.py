@@ -4,7 +4,9 @@ while True:
     print("2. Reset Entire System (DELETE ALL DATA)")
     print("3. Fetch / Print System Data Summary")
     print("4. Create Dean Account")
-    print("5. Exit")
+    print("5. Bulk Seed (scaled load-test data)")
+    print("6. Setup Database Schema (indexes & constraints)")
+    print("7. Exit")
 
     choice = input("Enter your choice: ").strip()
 
@@ -33,6 +35,30 @@ while True:
             seed_dean_account()
 
         case "5":
+            scale = input("Scale factor (e.g. 1, 10, 100): ").strip() or "1"
+            try:
+                scale = float(scale)
+            except ValueError:
+                print("❗ Invalid scale factor.")
+                continue
+            from services.full_seed import run_bulk_seed, seeded_data_exists
+            reset = False
+            if seeded_data_exists():
+                confirm = input(
+                    "⚠️ Database already has seeded data. Type YES to delete it "
+                    "(dean accounts are kept) and reseed: "
+                ).strip()
+                if confirm != "YES":
+                    print("❌ Bulk seed cancelled")
+                    continue
+                reset = True
+            run_bulk_seed(scale, reset=reset)
+
+        case "6":
+            from services.setup_schema import setup_schema
+            setup_schema()
+
+        case "7":
             print("👋 Exiting Admin Tools...")
             break
 
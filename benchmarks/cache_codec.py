@@ -0,0 +1,126 @@
+import argparse
+import json
+import random
+import string
+import time
+
+from services import cache
+
+# Encode/decode time and stored bytes per cache entry type, for every codec
+# with and without compression. Entries are synthetic but shaped like what
+# the menus cache; no Redis needed.
+#     python -m benchmarks.cache_codec --runs 2000 --json codec.json
+
+
+def _text(n):
+    return "".join(random.choices(string.ascii_letters + "     ", k=n))
+
+
+def _course(i):
+    return {
+        "course_id": f"CS{i:04}",
+        "details": {
+            "course_name": f"Course {_text(18).strip()}",
+            "instructor_name": f"Instructor {i % 40}",
+            "room": f"Room {i % 20 + 1}",
+            "schedule": {
+                "days": ["Sunday", "Tuesday"],
+                "start_time": "10:00",
+                "end_time": "12:00",
+                "start_min": 600,
+                "end_min": 720,
+                "day_mask": 5
+            },
+            "registered_students_count": random.randint(0, 40),
+            "capacity": 40
+        },
+        "c_id": f"course_{i:032x}"
+    }
+
+
+def _task(i, answered):
+    task = {
+        "assignment_id": f"{i:08x}-0000-4000-8000-{i:012x}",
+        "title": f"Assignment {i}",
+        "description": _text(200),
+        "deadline": "2026-12-01 23:59",
+        "max_grade": "100"
+    }
+    if answered:
+        task.update({"grade": str(random.randint(0, 100)), "answer": _text(800)})
+    return task
+
+
+def sample_entries():
+    return {
+        "course_details": {
+            "success": True,
+            "course": _course(1),
+            "completed_tasks": [_task(i, True) for i in range(10)],
+            "pending_tasks": [_task(i, False) for i in range(10, 20)]
+        },
+        "catalogue_page": {
+            "success": True,
+            "courses": [_course(i) for i in range(20)],
+            "next_cursor": "CS0019"
+        },
+        "pending_tasks": {
+            "success": True,
+            "tasks": [{**_task(i, False), "course_name": f"Course {i % 8}"} for i in range(40)]
+        },
+        "enrolled_students": {
+            "success": True,
+            "students": [{"studentID": f"student_{i:032x}", "studentName": _text(16)} for i in range(200)]
+        }
+    }
+
+
+def _time_per_call(fn, arg, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn(arg)
+    return (time.perf_counter() - start) / runs
+
+
+def run(runs=2000):
+    results = []
+    for entry, value in sample_entries().items():
+        for codec in cache.CODECS:
+            for label, threshold in (("raw", None), ("zlib", cache.CACHE_COMPRESS_THRESHOLD)):
+                data = cache.encode(value, codec, threshold)
+                results.append({
+                    "entry": entry,
+                    "codec": codec,
+                    "compression": label if threshold is not None and data[1:2] == b"z" else "raw",
+                    "bytes": len(data),
+                    "encode_us": _time_per_call(lambda v: cache.encode(v, codec, threshold), value, runs) * 1e6,
+                    "decode_us": _time_per_call(cache.decode, data, runs) * 1e6
+                })
+    return results
+
+
+def print_report(results):
+    print("\n🧪 ===== CACHE CODECS =====")
+    print(f"{'entry':<20}{'codec':<10}{'comp':<6}{'bytes':>9}{'enc us':>10}{'dec us':>10}")
+    for r in results:
+        print(
+            f"{r['entry']:<20}{r['codec']:<10}{r['compression']:<6}{r['bytes']:>9}"
+            f"{r['encode_us']:>10.1f}{r['decode_us']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare cache codecs")
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="output", help="write the results to this file")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    results = run(args.runs)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Report written to {args.output}")
@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Everything main.py imports before showing the login prompt
+# (main.py itself starts the menu loop, so it can't be imported directly).
+STARTUP_MODULES = [
+    "menus.login",
+    "menus.student",
+    "menus.instructor",
+    "menus.dean",
+    "services.academic_network_service",
+    "services.auth_user_service",
+    "services.student_information_service",
+]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr):
+    # Lines look like: "import time:      1234 |      5678 |   package.module"
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, rest = line.split(":", 1)
+        self_us, cumulative_us, name = rest.split("|")
+        name = name[1:]
+        modules.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us)
+        })
+    return modules
+
+
+def measure(modules=STARTUP_MODULES):
+    code = "import " + ", ".join(modules)
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True
+    )
+    wall = time.perf_counter() - start
+
+    if proc.returncode != 0:
+        return {"success": False, "error": proc.stderr.strip().splitlines()[-1]}
+
+    rows = parse_importtime(proc.stderr)
+    top_level = [r for r in rows if r["depth"] == 0]
+    return {
+        "success": True,
+        "wall_seconds": wall,
+        "total_import_us": sum(r["cumulative_us"] for r in top_level),
+        "modules": rows
+    }
+
+
+def run(runs=5, top=15, output=None):
+    results = [measure() for _ in range(runs)]
+    failed = [r for r in results if not r["success"]]
+    if failed:
+        print("❌ Import failed:", failed[0]["error"])
+        return failed[0]
+
+    walls = sorted(r["wall_seconds"] for r in results)
+    imports = sorted(r["total_import_us"] for r in results)
+    report = {
+        "python": sys.version.split()[0],
+        "runs": runs,
+        "modules": STARTUP_MODULES,
+        "wall_seconds_median": walls[len(walls) // 2],
+        "import_us_median": imports[len(imports) // 2],
+        "slowest": sorted(
+            results[-1]["modules"], key=lambda r: r["self_us"], reverse=True
+        )[:top]
+    }
+
+    print("\n⏱️ ===== IMPORT TIME =====")
+    print(f"Process wall time (median of {runs}): {report['wall_seconds_median'] * 1000:.1f} ms")
+    print(f"Import time       (median of {runs}): {report['import_us_median'] / 1000:.1f} ms")
+    print(f"\nTop {top} modules by self time:")
+    for r in report["slowest"]:
+        print(f"  {r['self_us'] / 1000:8.2f} ms  {r['module']}")
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📄 Report written to {output}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure CLI startup import time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", dest="output", help="write the report to this file")
+    args = parser.parse_args()
+    run(args.runs, args.top, args.output)
@@ -0,0 +1,279 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from services import cache
+from services.auth_user_service import authenticate_user
+from services.course_activity_service import (
+    get_pending_assignments_for_courses,
+    load_catalogue_page,
+    load_course_details,
+    update_grades
+)
+from services.student_information_service import (
+    assignments_col,
+    courses_col,
+    enroll_in_course,
+    enrollments_col,
+    get_course_details
+)
+
+# Registration-day load against whatever backends services/connections.py points at
+# (by default the docker-compose stack). It WRITES enrollments and grades, so run it
+# against a freshly seeded database:
+#     python -m services.full_seed --scale 1 --reset
+#     python -m benchmarks.registration_load --students 300 --json bench.json
+#     python -m benchmarks.registration_load --compare bench.json
+
+STUDENTS_FILE = os.path.join(ROOT, "students_credentials.txt")
+INSTRUCTORS_FILE = os.path.join(ROOT, "instructors_credentials.txt")
+
+
+# ==============================
+# Recording
+# ==============================
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+        self.exceptions = {}
+
+    def call(self, op, fn, *args):
+        start = time.perf_counter()
+        exception = None
+        try:
+            result = fn(*args)
+            failed = isinstance(result, dict) and result.get("success") is False
+        except Exception as e:
+            result = None
+            failed = True
+            exception = type(e).__name__
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.samples.setdefault(op, []).append(elapsed)
+            if failed:
+                self.errors[op] = self.errors.get(op, 0) + 1
+            if exception:
+                by_type = self.exceptions.setdefault(op, {})
+                by_type[exception] = by_type.get(exception, 0) + 1
+        return result
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def summarize(recorder, wall_seconds):
+    operations = {}
+    for op, samples in sorted(recorder.samples.items()):
+        values = sorted(samples)
+        operations[op] = {
+            "count": len(values),
+            "errors": recorder.errors.get(op, 0),
+            "exceptions": recorder.exceptions.get(op, {}),
+            "throughput_per_s": len(values) / wall_seconds if wall_seconds else 0.0,
+            "mean_ms": sum(values) / len(values) * 1000,
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "max_ms": values[-1] * 1000
+        }
+    return operations
+
+
+# ==============================
+# Simulated users
+# ==============================
+
+def load_credentials(path, limit):
+    users = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = [p.strip() for p in line.rstrip("\n").split(" | ")]
+            if len(parts) == 3:
+                users.append({"id": parts[0], "name": parts[1], "password": parts[2]})
+    return users[:limit]
+
+
+def simulate_student(recorder, student, course_ids, courses_per_student):
+    recorder.call("authenticate_user", authenticate_user, student["id"], student["password"])
+    recorder.call("load_catalogue_page", load_catalogue_page)
+
+    for course_id in random.sample(course_ids, min(courses_per_student, len(course_ids))):
+        recorder.call("enroll_in_course", enroll_in_course, student["id"], course_id)
+
+    enrolled = [
+        e["course_id"]
+        for e in enrollments_col.find({"student_id": student["id"]}, {"course_id": 1, "_id": 0})
+    ]
+    for course_id in enrolled:
+        recorder.call("get_course_details", get_course_details, course_id, student["id"])
+        recorder.call("load_course_details", load_course_details, student["id"], course_id)
+    recorder.call(
+        "get_pending_assignments_for_courses",
+        get_pending_assignments_for_courses, student["id"], enrolled
+    )
+
+
+def simulate_instructor(recorder, instructor, gradebook, grades_per_instructor):
+    recorder.call("authenticate_user", authenticate_user, instructor["id"], instructor["password"])
+    for _ in range(grades_per_instructor):
+        if not gradebook:
+            return
+        assignment_id, student_id = random.choice(gradebook)
+        recorder.call("update_grades", update_grades, assignment_id, student_id, str(random.randint(0, 100)))
+
+
+def build_gradebook(limit=5000):
+    # (assignment_id, student_id) pairs of students enrolled in the assignment's course
+    students_by_course = {}
+    for e in enrollments_col.find({}, {"student_id": 1, "course_id": 1, "_id": 0}).limit(limit):
+        students_by_course.setdefault(e["course_id"], []).append(e["student_id"])
+    pairs = []
+    for a in assignments_col.find({}, {"assignment_id": 1, "course_id": 1, "_id": 0}):
+        for student_id in students_by_course.get(a["course_id"], [])[:20]:
+            pairs.append((a["assignment_id"], student_id))
+    return pairs
+
+
+# ==============================
+# Runner
+# ==============================
+
+def git_version():
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(students=300, instructors=20, workers=50, courses_per_student=4, grades_per_instructor=50):
+    student_users = load_credentials(STUDENTS_FILE, students)
+    instructor_users = load_credentials(INSTRUCTORS_FILE, instructors)
+    course_ids = [c["course_id"] for c in courses_col.find({}, {"course_id": 1, "_id": 0})]
+    if not student_users or not course_ids:
+        raise SystemExit("❌ No seeded data found. Run the seed first.")
+
+    recorder = Recorder()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(simulate_student, recorder, s, course_ids, courses_per_student)
+            for s in student_users
+        ]
+        for f in futures:
+            f.result()
+
+        gradebook = build_gradebook()
+        futures = [
+            pool.submit(simulate_instructor, recorder, i, gradebook, grades_per_instructor)
+            for i in instructor_users
+        ]
+        for f in futures:
+            f.result()
+    wall = time.perf_counter() - start
+
+    return {
+        "version": git_version(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "students": len(student_users),
+            "instructors": len(instructor_users),
+            "workers": workers,
+            "courses_per_student": courses_per_student,
+            "grades_per_instructor": grades_per_instructor
+        },
+        "wall_seconds": wall,
+        "operations": summarize(recorder, wall),
+        "local_cache": cache.local_stats()
+    }
+
+
+def print_report(report):
+    print(f"\n📊 ===== REGISTRATION LOAD ({report['version']}) =====")
+    print(f"Wall time: {report['wall_seconds']:.2f}s, config: {report['config']}\n")
+    print(f"{'operation':<38}{'count':>7}{'err':>6}{'ops/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for op, s in report["operations"].items():
+        print(
+            f"{op:<38}{s['count']:>7}{s['errors']:>6}{s['throughput_per_s']:>9.1f}"
+            f"{s['p50_ms']:>7.1f}ms{s['p95_ms']:>7.1f}ms{s['p99_ms']:>7.1f}ms"
+        )
+    raised = [(op, s["exceptions"]) for op, s in report["operations"].items() if s.get("exceptions")]
+    if raised:
+        print("\n⚠️ Exceptions:")
+        for op, by_type in raised:
+            print(f"  {op}: " + ", ".join(f"{name} x{n}" for name, n in sorted(by_type.items())))
+
+    local = report.get("local_cache")
+    if local:
+        print(
+            f"\n🧠 Local cache: {local['hits']} hits / {local['misses']} misses "
+            f"({local['hit_rate']:.0%}), size {local['size']}/{local['maxsize']}, "
+            f"{local['evictions']} evicted, {local['expirations']} expired, "
+            f"{local['invalidations']} invalidated"
+        )
+
+
+def compare(report, baseline, threshold):
+    # Returns the operations whose p95 grew by more than `threshold` (fraction).
+    regressions = []
+    print(f"\n🔍 Compared with {baseline['version']} (p95, threshold +{threshold:.0%}):")
+    for op, s in report["operations"].items():
+        old = baseline["operations"].get(op)
+        if not old or not old["p95_ms"]:
+            continue
+        change = s["p95_ms"] / old["p95_ms"] - 1
+        flag = "❌" if change > threshold else "✅"
+        print(f"  {flag} {op:<38}{old['p95_ms']:>8.1f}ms -> {s['p95_ms']:>8.1f}ms ({change:+.0%})")
+        if change > threshold:
+            regressions.append(op)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Registration-day load generator")
+    parser.add_argument("--students", type=int, default=300)
+    parser.add_argument("--instructors", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=50)
+    parser.add_argument("--courses-per-student", type=int, default=4)
+    parser.add_argument("--grades-per-instructor", type=int, default=50)
+    parser.add_argument("--json", dest="output", help="write the report to this file")
+    parser.add_argument("--compare", help="baseline report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed p95 growth (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    report = run(
+        args.students, args.instructors, args.workers,
+        args.courses_per_student, args.grades_per_instructor
+    )
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📄 Report written to {args.output}")
+
+    if baseline and compare(report, baseline, args.threshold):
+        sys.exit(1)
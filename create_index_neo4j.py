@@ -1,19 +1,21 @@
-from services.academic_network_service import driver
+from services.academic_network_service import ensure_schema, index_report
 
 def create_indexes():
-    with driver.session() as session:
-        session.run(
-            "CREATE INDEX student_id IF NOT EXISTS FOR (s:Student) ON (s.id)"
-        )
-        session.run(
-            "CREATE INDEX instructor_id IF NOT EXISTS FOR (i:Instructor) ON (i.id)"
-        )
-        session.run(
-            "CREATE INDEX course_id IF NOT EXISTS FOR (c:Course) ON (c.id)"
-        )
-        session.run(
-            "CREATE INDEX assignment_id IF NOT EXISTS FOR (a:Assignment) ON (a.id)"
-        )
+    result = ensure_schema(force=True)
+    if result["success"]:
+        print("✅ Neo4j uniqueness constraints created (or already exist)")
+    for f in result.get("failed", []):
+        print(f"❌ Constraint {f['constraint']} on :{f['label']}({f['property']}) not created: {f['error']}")
 
-    print("✅ Neo4j indexes created (or already exist)")
+    report = index_report()
+    if "error" in report:
+        print("❌ Could not read indexes:", report["error"])
+        return
+
+    for m in report["missing"]:
+        print(f"⚠️ Missing index: :{m['label']}({m['property']})")
+    for u in report["unused"]:
+        print(f"ℹ️ Unused index: {u['name']} on {u['labels']} {u['properties']}")
+    if not report["missing"] and not report["unused"]:
+        print("✅ All indexes present and in use")
 create_indexes()
@@ -2,11 +2,10 @@ from menus.login import login_screen
 from menus.student import student_dashboard
 from menus.instructor import instructor_dashboard
 from menus.dean import dean_dashboard
-from services.academic_network_service import get_instructor_courses_ids
 from services.auth_user_service import create_user_session
 import time
 
-from services.student_information_service import get_courses
+from services.course_activity_service import load_instructor_courses
 
 while True :
     print("1. login")
@@ -23,8 +22,7 @@ while True :
                     student_dashboard(session, current_user['userID'])
 
                 case "instructor":
-                    courseIDs = get_instructor_courses_ids(current_user['userID'])
-                    courses_details = get_courses(courseIDs)
+                    courses_details = load_instructor_courses(current_user['userID'])
                     instructor_dashboard(courses_details, session, current_user['userID'])
 
                 case "dean":
@@ -3,6 +3,7 @@ from services.academic_network_service import create_instructor_node, create_stu
 from services.auth_user_service import validate_session, refresh_user_session
 from services.course_activity_service import invalidate_available_courses_cache, invalidate_instructor_courses_cache
 from services.student_information_service import create_course, get_available_instructors, get_available_rooms, register_instructor, register_student
+from services.timetable_service import commit_timetable, load_course_requests_csv, solve_timetable
 import secrets
 import string
 
@@ -35,7 +36,8 @@ def dean_dashboard(session):
         print("2. Create Student")
         print("3. Create Instructor")
         print("4. Student Stats")
-        print("5. Exit")
+        print("5. Auto-Schedule Courses (CSV)")
+        print("6. Exit")
         choice = input("Enter your choice: ")
         if not ensure_session(session):
             break
@@ -54,6 +56,9 @@ def dean_dashboard(session):
                 pass
 
             case "5":
+                auto_schedule_screen(session)
+
+            case "6":
                 break
 
             case _:
@@ -191,6 +196,56 @@ def add_course_screen(session):
     invalidate_available_courses_cache()
 
 
+def auto_schedule_screen(session):
+    print("===Auto-Schedule Courses===")
+    print("CSV columns: course_id, course_name, expected_enrollment, instructor_name, preferred_instructors")
+    path = input("Enter CSV file path: ").strip()
+    try:
+        course_requests = load_course_requests_csv(path)
+    except (OSError, ValueError) as e:
+        print("❌ Could not read file:", e)
+        time.sleep(1)
+        return
+    if not is_session_valid(session):
+        return
+    refresh_user_session(session["sessionID"])
+
+    result = solve_timetable(course_requests)
+    scheduled = result["scheduled"]
+    print(f"\n✅ Scheduled {len(scheduled)} / {len(course_requests)} courses in {result['seconds']:.2f}s")
+    for course in scheduled:
+        details = course["details"]
+        schedule = details["schedule"]
+        print(
+            f"  {course['course_id']:<8} {', '.join(schedule['days'])} "
+            f"{schedule['start_time']}-{schedule['end_time']} | Room {details['room']} | {details['instructor_name']}"
+        )
+    if result["unscheduled"]:
+        print(f"\n⚠️ Could not schedule {len(result['unscheduled'])} courses:")
+        for item in result["unscheduled"]:
+            print(f"  {item['course_id']}: {item['reason']}")
+
+    if not scheduled:
+        input("Press any key to back...")
+        return
+    confirm = input("Save this timetable? (y/n): ").strip().lower()
+    if confirm != "y":
+        return
+    if not is_session_valid(session):
+        return
+    refresh_user_session(session["sessionID"])
+
+    saved = commit_timetable(scheduled)
+    print(f"✅ {len(saved['inserted'])} courses saved")
+    if saved["failed"]:
+        print(f"⚠️ Not saved ({len(saved['failed'])}):")
+        for item in saved["failed"]:
+            print(f"  {item['course_id']}: {item['error']}")
+    for instructor_id in saved["instructor_ids"]:
+        invalidate_instructor_courses_cache(instructor_id)
+    invalidate_available_courses_cache()
+
+
 def create_student_screen(session):
     print("===Create Student===")
     full_name = input("Insert full name: ")
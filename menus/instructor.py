@@ -1,8 +1,8 @@
 import time
 import uuid
-from services.academic_network_service import get_course_assignments, get_course_students, link_assignment_to_course
+from services.academic_network_service import link_assignment_to_course
 from services.auth_user_service import validate_session, refresh_user_session
-from services.course_activity_service import cache_course_assignments, cache_enrolled_students, create_assignment, get_answer, get_cached_course_assignments, get_cached_enrolled_students, invalidate_course_details_cache, invalidate_instructor_course_assignments_cache, invalidate_pending_tasks_cache_for_course, invalidate_student_course_details_cache, invalidate_student_pending_task_cache, update_grades
+from services.course_activity_service import create_assignment, get_answer, invalidate_course_details_cache, invalidate_course_details_cache_for_students, invalidate_instructor_course_assignments_cache, invalidate_pending_tasks_cache_for_course, invalidate_student_course_details_cache, invalidate_student_pending_task_cache, get_assignment_submissions, load_course_assignments, load_enrolled_students, load_grades_csv, update_grades, update_grades_bulk
 
 def ensure_session(session):
 
@@ -66,7 +66,8 @@ def view_course_screen(course_details, session, user_id):
         print("\n1. Add Assignment")
         print("2. Insert Grades")
         print("3. View Enrolled Students")
-        print("4. Exit")
+        print("4. Gradebook (all students)")
+        print("5. Exit")
         choice = input("Enter your choice: ")
         if not is_session_valid(session):
             break
@@ -82,6 +83,9 @@ def view_course_screen(course_details, session, user_id):
                 pass
 
             case "4":
+                gradebook_screen(session, course_details['course_id'])
+
+            case "5":
                 break
 
             case _:
@@ -111,14 +115,8 @@ def add_assignment_screen(session, course_id, user_id):
     invalidate_course_details_cache(course_id)
     invalidate_pending_tasks_cache_for_course(course_id)
 
-def grade_assignment_screen(session, course_id):
-    course_assignments = get_cached_course_assignments(course_id)
-    if not course_assignments:
-        course_assignments = get_course_assignments(course_id)
-        cache_course_assignments(course_id, course_assignments)
-        print("from neo4j")
-    else:
-        print("from redis")
+def select_assignment(session, course_id):
+    course_assignments = load_course_assignments(course_id)
 
     assignments = course_assignments.get("assignments", [])
 
@@ -149,18 +147,15 @@ def grade_assignment_screen(session, course_id):
             print("❗Invalid choice, please try again.")
             time.sleep(1)
         else:
-            assignment = assignments[choice - 1]
-            break
+            return assignments[choice - 1]
 
-    enrolled_students = get_cached_enrolled_students(course_id)
-    if not enrolled_students:
-        enrolled_students = get_course_students(course_id)
-        cache_enrolled_students(course_id, enrolled_students)
-        print("from neo4j")
-    else:
-        print("from redis")
 
-    students = enrolled_students.get("students", [])
+def grade_assignment_screen(session, course_id):
+    assignment = select_assignment(session, course_id)
+    if not assignment:
+        return
+
+    students = load_enrolled_students(course_id).get("students", [])
 
     if not students:
         print("No students enrolled in this course.")
@@ -227,4 +222,83 @@ def grade_assignment_screen(session, course_id):
             case _:
                 print("❗Invalid choice, please try again.")
                 time.sleep(1)
-    
+
+
+def gradebook_screen(session, course_id):
+    assignment = select_assignment(session, course_id)
+    if not assignment:
+        return
+
+    students = load_enrolled_students(course_id).get("students", [])
+    if not students:
+        print("No students enrolled in this course.")
+        input("Press any key to back...")
+        return
+
+    assignment_id = assignment['assignmentID']
+    result = get_assignment_submissions(assignment_id, [s['studentID'] for s in students])
+    if not result["success"]:
+        print(f"❌ {result['error']}")
+        input("Press any key to back...")
+        return
+    submissions = result["submissions"]
+
+    print(f"\n--- Gradebook: {assignment['assignmentTitle']} ---")
+    for i, s in enumerate(students, start=1):
+        sub = submissions.get(s['studentID'], {})
+        print(f"{i}. {s['studentName']} ({s['studentID']})")
+        print(f"   Answer : {sub.get('text') or 'No answer submitted'}")
+        print(f"   Grade  : {sub.get('grade', 'Not graded yet')}")
+    print("-------------------------\n")
+
+    grades = {}
+    while True:
+        print("1. Enter grades (blank to skip a student)")
+        print("2. Import grades from CSV (student_id, grade)")
+        print("3. Exit")
+        choice = input("Enter your choice: ")
+        match choice:
+            case "1":
+                for s in students:
+                    grade_input = input(f"Grade for {s['studentName']}: ").strip()
+                    if grade_input:
+                        grades[s['studentID']] = grade_input
+                break
+
+            case "2":
+                path = input("CSV file path: ").strip()
+                try:
+                    imported = load_grades_csv(path)
+                except OSError as e:
+                    print(f"❌ {e}")
+                    continue
+                enrolled_ids = {s['studentID'] for s in students}
+                grades = {sid: g for sid, g in imported.items() if sid in enrolled_ids}
+                skipped = len(imported) - len(grades)
+                if skipped:
+                    print(f"⚠️ {skipped} rows skipped (student not enrolled in this course)")
+                break
+
+            case "3":
+                return
+
+            case _:
+                print("❗Invalid choice, please try again.")
+                time.sleep(1)
+
+    if not grades:
+        print("No grades to submit.")
+        input("Press any key to back...")
+        return
+
+    input(f"Press any key to submit {len(grades)} grades...")
+    if not is_session_valid(session):
+        return
+    refresh_user_session(session["sessionID"])
+    result = update_grades_bulk(assignment_id, grades)
+    if not result["success"]:
+        print(f"❌ {result['error']}")
+    else:
+        invalidate_course_details_cache_for_students(list(grades), course_id)
+        print(f"✅ {len(grades)} grades saved")
+    input("Press any key to back...")
@@ -1,14 +1,8 @@
 import time
-from services.academic_network_service import get_student_enrolled_course_ids, link_student_to_assignment, link_student_to_course
+from services.academic_network_service import link_student_to_assignment, link_student_to_course
 from services.auth_user_service import validate_session, refresh_user_session
-from services.course_activity_service import cache_available_courses, cache_pending_tasks, cache_student_course_details, cache_student_courses, create_answer_document, get_cached_available_courses, get_cached_pending_tasks, get_cached_student_course_details, get_cached_student_courses, get_pending_assignments_for_courses, invalidate_enrolled_students_cache, invalidate_student_available_courses_cache, invalidate_student_course_details_cache, invalidate_student_courses_cache, invalidate_student_pending_task_cache
-from services.student_information_service import enroll_in_course, get_available_courses_for_registration, get_course_details, get_courses
-
-from pymongo import MongoClient
-mongo_client = MongoClient("mongodb://localhost:27017/")
-mongo_db = mongo_client["university_portal"]
-rooms_col = mongo_db["rooms"]
-students_col = mongo_db["students"]
+from services.course_activity_service import create_answer_document, load_catalogue_page, load_course_details, load_pending_tasks, load_student_courses, load_student_enrolled_ids, record_enrollment, record_submission
+from services.student_information_service import enroll_in_course, students_col
 
 def ensure_session(session):
     if not validate_session(session["sessionID"])["valid"]:
@@ -51,17 +45,44 @@ def student_dashboard(session, user_id):
                 print("❗Invalid choice, please try again.")
                 time.sleep(1)
 
+def catalogue_filters_screen():
+    filters = {}
+    days = input("Days (e.g. Sunday,Tuesday, blank for any): ").strip()
+    if days:
+        filters["days"] = [d.strip().capitalize() for d in days.split(",") if d.strip()]
+    from_time = input("Starting no earlier than (HH:MM, blank for any): ").strip()
+    if from_time:
+        filters["from_time"] = from_time
+    to_time = input("Ending no later than (HH:MM, blank for any): ").strip()
+    if to_time:
+        filters["to_time"] = to_time
+    instructor = input("Instructor full name (blank for any): ").strip()
+    if instructor:
+        filters["instructor_name"] = instructor
+    search = input("Course name contains word (blank for any): ").strip()
+    if search:
+        filters["search"] = search
+    if input("Only courses with free seats? (y/N): ").strip().lower() == "y":
+        filters["free_seats_only"] = True
+    return filters
+
+
 def register_course_screen(session, user_id):
-    available_courses = get_cached_available_courses(user_id)
-    if not available_courses:
-        enrolled_ids = get_student_enrolled_course_ids(user_id)
-        available_courses = get_available_courses_for_registration(enrolled_ids)
-        cache_available_courses(user_id, available_courses)
-        print("from mongo")
-    else:
-        print("from redis")
-    print("\n--- Available Courses ---")
+    filters = {}
+    cursors = [None]  # `after` value of every page visited, for going back
     while True:
+        page = load_catalogue_page(cursors[-1], filters)
+        if not page["success"]:
+            print(f"❌ {page['error']}")
+            filters = {}
+            cursors = [None]
+            time.sleep(1)
+            continue
+        # Catalogue pages are shared by every student; take out the student's own courses
+        enrolled_ids = load_student_enrolled_ids(user_id)
+        available_courses = [c for c in page["courses"] if c["course_id"] not in enrolled_ids]
+
+        print(f"\n--- Available Courses (page {len(cursors)}) ---")
         for idx, course in enumerate(available_courses, start=1):
             details = course.get("details", {})
             schedule = details.get("schedule", {})
@@ -70,9 +91,7 @@ def register_course_screen(session, user_id):
             instructor = details.get("instructor_name", "Unknown Instructor")
             room = details.get("room", "Unknown Room")
             registered = details.get("registered_students_count", 0)
-
-            room_doc = rooms_col.find_one({"room": room})
-            capacity = room_doc["capacity"] if room_doc and "capacity" in room_doc else "?"
+            capacity = details.get("capacity", "?")
 
             days = schedule.get("days", [])
             start = schedule.get("start_time", "")
@@ -86,11 +105,28 @@ def register_course_screen(session, user_id):
             print(f"   Time: {time_str}")
             print(f"   Room: {room}")
             print(f"   Registered Students: {registered}/{capacity}\n")
+        if not available_courses:
+            print("No courses match.\n")
+        if page["next_cursor"]:
+            print("N. Next page")
+        if len(cursors) > 1:
+            print("P. Previous page")
+        print("F. Filter courses" + (" (filters active)" if filters else ""))
         print(f"{len(available_courses) + 1}. Exit")
-        choice = input("Enter your choice: ")
+        choice = input("Enter your choice: ").strip().upper()
         if not is_session_valid(session):
             return
         refresh_user_session(session["sessionID"])
+        if choice == "N" and page["next_cursor"]:
+            cursors.append(page["next_cursor"])
+            continue
+        if choice == "P" and len(cursors) > 1:
+            cursors.pop()
+            continue
+        if choice == "F":
+            filters = catalogue_filters_screen()
+            cursors = [None]
+            continue
         if not choice.isdigit():
             print("❗ Invalid choice, please enter a number.")
             time.sleep(1)
@@ -105,23 +141,18 @@ def register_course_screen(session, user_id):
             course_id = available_courses[choice - 1]['course_id']
             student_doc = students_col.find_one({"student_id": user_id}, {"_id": 0, "full_name": 1})
             full_name = student_doc["full_name"] if student_doc else "Unknown"
-            enroll_in_course(user_id, course_id)
+            result = enroll_in_course(user_id, course_id)
+            if not result["success"]:
+                print(f"❌ {result['error']}")
+                time.sleep(1)
+                continue
             link_student_to_course(user_id, full_name, course_id)
-            invalidate_student_courses_cache(user_id)
-            invalidate_student_available_courses_cache(user_id)
-            invalidate_enrolled_students_cache(course_id)
+            record_enrollment(user_id, full_name, result["course"])
             # log_student_event (studentID, courseID, addCourse, timestamp)
             break
 
 def my_courses_screen(session, user_id):
-    student_courses = get_cached_student_courses(user_id)
-    if not student_courses :
-        courseIDs = get_student_enrolled_course_ids(user_id)
-        student_courses = get_courses(courseIDs)
-        cache_student_courses(user_id, student_courses)
-        print("from mongo")
-    else:
-        print("from redis")
+    student_courses = load_student_courses(user_id)
     while True:
         print("\n--- My Courses ---")
         for i, course in enumerate(student_courses, start=1):
@@ -149,14 +180,8 @@ def my_courses_screen(session, user_id):
 
     while True:
         print("\n--- Course Details ---")
-        student_course_details = get_cached_student_course_details(user_id, course_id)
         # log_student_event (studentID, courseID, VisitCourse, timestamp)
-        if not student_course_details:
-            student_course_details = get_course_details(course_id, user_id)
-            cache_student_course_details(user_id, course_id, student_course_details)
-            print("From mongo")
-        else:
-            print("From redis")
+        student_course_details = load_course_details(user_id, course_id)
         if not student_course_details or "course" not in student_course_details:
             print("❗ No course details found.")
             return
@@ -305,8 +330,7 @@ def pending_tasks(session, user_id, pending, course_id):
                     full_name = student_doc["full_name"] if student_doc else "Unknown"
                     link_student_to_assignment(user_id, full_name, assignment_id, assignment_title)
                     # log_student_event(studentID, courseID, assignmentID, submit assignment, timestamp)
-                    invalidate_student_pending_task_cache(user_id)
-                    invalidate_student_course_details_cache(user_id, course_id)
+                    record_submission(user_id, course_id, assignment_id, answer_text)
                     return
                 else:
                     print(f"❌ Failed to submit answer: {result.get('error')}")
@@ -322,15 +346,8 @@ def pending_tasks(session, user_id, pending, course_id):
 
 
 def pending_tasks_screen(session, user_id):
-    pending_tasks = get_cached_pending_tasks(user_id)
-    if not pending_tasks:
-        courseIDs = get_student_enrolled_course_ids(user_id)
-        pending_tasks = get_pending_assignments_for_courses(user_id, courseIDs)
-        cache_pending_tasks(user_id, pending_tasks)
-        print("from mongo")
-    else:
-        print("from redis")
-    if not pending_tasks:
+    pending_tasks = load_pending_tasks(user_id)
+    if not pending_tasks.get("tasks"):
         print("🎉 No pending assignments!")
     else:
         from collections import defaultdict
@@ -1,58 +1,223 @@
 from typing import List, Dict, Optional, Any
-import os
-from neo4j import GraphDatabase
+from contextlib import contextmanager
 from neo4j.exceptions import Neo4jError
 
+from services.connections import get_neo4j_driver
+
 
 # Neo4j Connection 
-NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
-NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
-NEO4J_PASS = os.getenv("NEO4J_PASS", "test1234")
-driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
-def write(query: str,) -> None:
+driver = get_neo4j_driver()
+BATCH_SIZE = 2000
+
+
+# Schema
+# Uniqueness constraints also provide the index MERGE uses to find a node by id.
+# Bump SCHEMA_VERSION whenever SCHEMA_CONSTRAINTS changes.
+SCHEMA_VERSION = 1
+SCHEMA_CONSTRAINTS = [
+    ("student_id_unique", "Student", "id"),
+    ("instructor_id_unique", "Instructor", "id"),
+    ("course_id_unique", "Course", "id"),
+    ("assignment_id_unique", "Assignment", "id"),
+]
+# Plain indexes from the old create_index_neo4j.py, by label; each blocks the
+# constraint on the same property until it is dropped.
+LEGACY_INDEXES = {
+    "Student": "student_id",
+    "Instructor": "instructor_id",
+    "Course": "course_id",
+    "Assignment": "assignment_id",
+}
+
+_schema_verified = False
+
+
+def _create_constraint(session, name: str, label: str, prop: str) -> None:
+    session.run(
+        f"CREATE CONSTRAINT {name} IF NOT EXISTS "
+        f"FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE"
+    ).consume()
+
+
+def _index_exists(session, name: str) -> bool:
+    return session.run(
+        "SHOW INDEXES YIELD name WHERE name = $name RETURN name", {"name": name}
+    ).single() is not None
+
+
+def _replace_legacy_index(session, name: str, label: str, prop: str) -> Optional[str]:
+    # Returns None once the constraint exists, else the reason it could not be
+    # created. The legacy index is only dropped for as long as it takes to try;
+    # it is put back if the constraint still fails (e.g. duplicate ids).
+    try:
+        _create_constraint(session, name, label, prop)
+        return None
+    except Neo4jError as e:
+        legacy = LEGACY_INDEXES.get(label)
+        if legacy is None or not _index_exists(session, legacy):
+            return str(e)
+
+    session.run(f"DROP INDEX {legacy} IF EXISTS").consume()
+    try:
+        _create_constraint(session, name, label, prop)
+        return None
+    except Neo4jError as e:
+        session.run(f"CREATE INDEX {legacy} IF NOT EXISTS FOR (n:{label}) ON (n.{prop})").consume()
+        return str(e)
+
+
+def ensure_schema(force: bool = False) -> dict:
+    global _schema_verified
+    if _schema_verified and not force:
+        return {"success": True, "created": False}
+
+    with driver.session() as session:
+        if not force:
+            marker = session.run(
+                "MATCH (m:SchemaMarker {name: 'academic_network'}) RETURN m.version AS version"
+            ).single()
+            if marker and marker["version"] == SCHEMA_VERSION:
+                _schema_verified = True
+                return {"success": True, "created": False}
+
+        failed = []
+        for name, label, prop in SCHEMA_CONSTRAINTS:
+            error = _replace_legacy_index(session, name, label, prop)
+            if error:
+                failed.append({"constraint": name, "label": label, "property": prop, "error": error})
+
+        # Only check once per process either way; without the marker the next
+        # process (or setup_schema) tries again.
+        _schema_verified = True
+        if failed:
+            return {"success": False, "created": False, "failed": failed}
+
+        session.run(
+            "MERGE (m:SchemaMarker {name: 'academic_network'}) SET m.version = $version",
+            {"version": SCHEMA_VERSION}
+        ).consume()
+
+    return {"success": True, "created": True}
+
+
+def index_report() -> dict:
+    try:
+        with driver.session() as session:
+            rows = list(session.run(
+                "SHOW INDEXES YIELD name, type, labelsOrTypes, properties, "
+                "owningConstraint, readCount"
+            ))
+    except Neo4jError as e:
+        return {"error": str(e)}
+
+    covered = set()
+    unused = []
+    for row in rows:
+        if row["type"] == "LOOKUP":
+            continue
+        for label in row["labelsOrTypes"] or []:
+            for prop in row["properties"] or []:
+                covered.add((label, prop))
+        if not row["readCount"]:
+            unused.append({
+                "name": row["name"],
+                "labels": row["labelsOrTypes"],
+                "properties": row["properties"],
+                "constraint": row["owningConstraint"]
+            })
+
+    missing = [
+        {"name": name, "label": label, "property": prop}
+        for name, label, prop in SCHEMA_CONSTRAINTS
+        if (label, prop) not in covered
+    ]
+    return {"success": True, "missing": missing, "unused": unused}
+
+
+def write(query: str, params: Optional[Dict[str, Any]] = None, tx=None) -> None:
+    # Inside a transaction() block the statement joins the caller's commit.
+    if tx is not None:
+        tx.run(query, params or {})
+        return
+    ensure_schema()
     def _tx(tx):
-        tx.run(query)
+        tx.run(query, params or {})
     with driver.session() as session:
         session.execute_write(_tx)
-def read(query: str):
+def read(query: str, params: Optional[Dict[str, Any]] = None):
+    ensure_schema()
     def _tx(tx):
-        return list(tx.run(query))
+        return list(tx.run(query, params or {}))
     with driver.session() as session:
         return session.execute_read(_tx)
 
 
+# Groups several writes into one commit:
+#     with transaction() as tx:
+#         link_instructor_to_course(instructorID, courseID, tx=tx)
+#         link_assignment_to_course(assignmentID, courseID, title, tx=tx)
+@contextmanager
+def transaction():
+    ensure_schema()
+    with driver.session() as session:
+        tx = session.begin_transaction()
+        try:
+            yield tx
+            tx.commit()
+        except Exception:
+            tx.rollback()
+            raise
+
+
+# Runs `query` once per chunk of rows, bound as $rows (query starts with UNWIND $rows AS row)
+def write_batch(query: str, rows: List[Dict[str, Any]], batch_size: int = BATCH_SIZE) -> int:
+    def _tx(tx, chunk):
+        tx.run(query, {"rows": chunk})
+    ensure_schema()
+    with driver.session() as session:
+        for i in range(0, len(rows), batch_size):
+            session.execute_write(_tx, rows[i:i + batch_size])
+    return len(rows)
+
+
 
 
 # Nodes creation 
-def create_student_node(studentID: str, name: str) -> dict:
+def create_student_node(studentID: str, name: str, tx=None) -> dict:
     try:
-        write(f"MERGE (s:Student {{id:'{studentID}'}}) SET s.name = '{name}'")
+        write(
+            "MERGE (s:Student {id: $studentID}) SET s.name = $name",
+            {"studentID": studentID, "name": name},
+            tx
+        )
         return {"success": True}
     except Neo4jError as e:
         return {"error": str(e)}
 
 
-def create_instructor_node(instructorID: str) -> dict:
+def create_instructor_node(instructorID: str, tx=None) -> dict:
     try:
-        write(f"MERGE (i:Instructor {{id:'{instructorID}'}})")
+        write("MERGE (i:Instructor {id: $instructorID})", {"instructorID": instructorID}, tx)
         return {"success": True}
     except Neo4jError as e:
         return {"error": str(e)}
 
 
-def create_course_node(courseID: str) -> dict:
+def create_course_node(courseID: str, tx=None) -> dict:
     try:
-        write(f"MERGE (c:Course {{id:'{courseID}'}}) ")
+        write("MERGE (c:Course {id: $courseID})", {"courseID": courseID}, tx)
         return {"success": True}
     except Neo4jError as e:
         return {"error": str(e)}
 
 
-def create_assignment_node(assignmentID: str, assignment_title: str) -> dict:
+def create_assignment_node(assignmentID: str, assignment_title: str, tx=None) -> dict:
     try:
         write(
-            f"MERGE (a:Assignment {{id:'{assignmentID}'}}) "
-            f"SET a.title = '{assignment_title}'"
+            "MERGE (a:Assignment {id: $assignmentID}) "
+            "SET a.title = $title",
+            {"assignmentID": assignmentID, "title": assignment_title},
+            tx
         )
         return {"success": True}
     except Neo4jError as e:
@@ -64,17 +229,19 @@ def create_assignment_node(assignmentID: str, assignment_title: str) -> dict:
 
 
 # Relationships
+# Each link MERGEs both endpoints and the relationship in a single statement.
 def link_instructor_to_course(
     instructorID: str,
     courseID: str,
+    tx=None
 ) -> dict:
     try:
-        create_instructor_node(instructorID)
-        create_course_node(courseID)
-
         write(
-            f"MATCH (i:Instructor {{id:'{instructorID}'}}), (c:Course {{id:'{courseID}'}}) "
-            f"MERGE (i)-[:TEACHES]->(c)"
+            "MERGE (i:Instructor {id: $instructorID}) "
+            "MERGE (c:Course {id: $courseID}) "
+            "MERGE (i)-[:TEACHES]->(c)",
+            {"instructorID": instructorID, "courseID": courseID},
+            tx
         )
         return {"success": True}
     except Neo4jError as e:
@@ -85,14 +252,15 @@ def link_student_to_course(
     studentID: str,
     studentName: str,
     courseID: str,
+    tx=None
 ) -> dict:
     try:
-        create_student_node(studentID,studentName)
-        create_course_node(courseID)
-
         write(
-            f"MATCH (s:Student {{id:'{studentID}'}}), (c:Course {{id:'{courseID}'}}) "
-            f"MERGE (s)-[:ENROLLED_IN]->(c)"
+            "MERGE (s:Student {id: $studentID}) SET s.name = $studentName "
+            "MERGE (c:Course {id: $courseID}) "
+            "MERGE (s)-[:ENROLLED_IN]->(c)",
+            {"studentID": studentID, "studentName": studentName, "courseID": courseID},
+            tx
         )
         return {"success": True}
     except Neo4jError as e:
@@ -102,16 +270,16 @@ def link_student_to_course(
 def link_assignment_to_course(
     assignmentID: str,
     courseID: str,
-    assignment_title: str
-
+    assignment_title: str,
+    tx=None
 ) -> dict:
     try:
-        create_assignment_node(assignmentID, assignment_title)
-        create_course_node(courseID)
-
         write(
-            f"MATCH (a:Assignment {{id:'{assignmentID}'}}), (c:Course {{id:'{courseID}'}}) "
-            f"MERGE (a)-[:BELONGS_TO]->(c)"
+            "MERGE (a:Assignment {id: $assignmentID}) SET a.title = $title "
+            "MERGE (c:Course {id: $courseID}) "
+            "MERGE (a)-[:BELONGS_TO]->(c)",
+            {"assignmentID": assignmentID, "title": assignment_title, "courseID": courseID},
+            tx
         )
         return {"success": True}
     except Neo4jError as e:
@@ -122,15 +290,21 @@ def link_student_to_assignment(
     studentID: str,
     studentName: str,
     assignmentID: str,
-    assignment_title: str
+    assignment_title: str,
+    tx=None
 ) -> dict:
     try:
-        create_student_node(studentID, studentName)
-        create_assignment_node(assignmentID, assignment_title)
-
         write(
-            f"MATCH (s:Student {{id:'{studentID}'}}), (a:Assignment {{id:'{assignmentID}'}}) "
-            f"MERGE (s)-[:SUBMITTED]->(a)"
+            "MERGE (s:Student {id: $studentID}) SET s.name = $studentName "
+            "MERGE (a:Assignment {id: $assignmentID}) SET a.title = $title "
+            "MERGE (s)-[:SUBMITTED]->(a)",
+            {
+                "studentID": studentID,
+                "studentName": studentName,
+                "assignmentID": assignmentID,
+                "title": assignment_title
+            },
+            tx
         )
         return {"success": True}
     except Neo4jError as e:
@@ -139,12 +313,78 @@ def link_student_to_assignment(
 
 
 
+# Batch operations
+# Each takes a list of tuples in the same order as the single-row function
+# and sends them through one UNWIND statement per BATCH_SIZE rows.
+def create_student_nodes(students: List[tuple]) -> dict:
+    try:
+        count = write_batch(
+            "UNWIND $rows AS row "
+            "MERGE (s:Student {id: row.studentID}) SET s.name = row.name",
+            [{"studentID": sid, "name": name} for sid, name in students]
+        )
+        return {"success": True, "count": count}
+    except Neo4jError as e:
+        return {"error": str(e)}
+
+
+def link_instructors_to_courses(pairs: List[tuple]) -> dict:
+    try:
+        count = write_batch(
+            "UNWIND $rows AS row "
+            "MERGE (i:Instructor {id: row.instructorID}) "
+            "MERGE (c:Course {id: row.courseID}) "
+            "MERGE (i)-[:TEACHES]->(c)",
+            [{"instructorID": iid, "courseID": cid} for iid, cid in pairs]
+        )
+        return {"success": True, "count": count}
+    except Neo4jError as e:
+        return {"error": str(e)}
+
+
+def link_students_to_courses(pairs: List[tuple]) -> dict:
+    try:
+        count = write_batch(
+            "UNWIND $rows AS row "
+            "MERGE (s:Student {id: row.studentID}) SET s.name = row.studentName "
+            "MERGE (c:Course {id: row.courseID}) "
+            "MERGE (s)-[:ENROLLED_IN]->(c)",
+            [
+                {"studentID": sid, "studentName": name, "courseID": cid}
+                for sid, name, cid in pairs
+            ]
+        )
+        return {"success": True, "count": count}
+    except Neo4jError as e:
+        return {"error": str(e)}
+
+
+def link_assignments_to_courses(rows: List[tuple]) -> dict:
+    try:
+        count = write_batch(
+            "UNWIND $rows AS row "
+            "MERGE (a:Assignment {id: row.assignmentID}) SET a.title = row.title "
+            "MERGE (c:Course {id: row.courseID}) "
+            "MERGE (a)-[:BELONGS_TO]->(c)",
+            [
+                {"assignmentID": aid, "courseID": cid, "title": title}
+                for aid, cid, title in rows
+            ]
+        )
+        return {"success": True, "count": count}
+    except Neo4jError as e:
+        return {"error": str(e)}
+
+
+
+
 # Queries
 def get_instructor_courses_ids(instructorID: str) -> list[str]:
     try:
         rows = read(
-            f"MATCH (i:Instructor {{id:'{instructorID}'}})-[:TEACHES]->(c:Course) "
-            f"RETURN c.id"
+            "MATCH (i:Instructor {id: $instructorID})-[:TEACHES]->(c:Course) "
+            "RETURN c.id",
+            {"instructorID": instructorID}
         )
         return [row["c.id"] for row in rows]
 
@@ -156,8 +396,9 @@ def get_instructor_courses_ids(instructorID: str) -> list[str]:
 def get_student_enrolled_course_ids(studentID: str) -> list[str]:
     try:
         rows = read(
-            f"MATCH (s:Student {{id:'{studentID}'}})-[:ENROLLED_IN]->(c:Course) "
-            f"RETURN c.id"
+            "MATCH (s:Student {id: $studentID})-[:ENROLLED_IN]->(c:Course) "
+            "RETURN c.id",
+            {"studentID": studentID}
         )
         return [row["c.id"] for row in rows]
 
@@ -169,8 +410,9 @@ def get_student_enrolled_course_ids(studentID: str) -> list[str]:
 def get_course_students(courseID: str) -> dict:
     try:
         rows = read(
-            f"MATCH (s:Student)-[:ENROLLED_IN]->(c:Course {{id:'{courseID}'}}) "
-            f"RETURN s.id, s.name"
+            "MATCH (s:Student)-[:ENROLLED_IN]->(c:Course {id: $courseID}) "
+            "RETURN s.id, s.name",
+            {"courseID": courseID}
         )
 
         students = [
@@ -191,8 +433,9 @@ def get_course_students(courseID: str) -> dict:
 def get_course_assignments(courseID: str) -> dict:
     try:
         rows = read(
-            f"MATCH (a:Assignment)-[:BELONGS_TO]->(c:Course {{id:'{courseID}'}}) "
-            f"RETURN a.id, a.title"
+            "MATCH (a:Assignment)-[:BELONGS_TO]->(c:Course {id: $courseID}) "
+            "RETURN a.id, a.title",
+            {"courseID": courseID}
         )
 
         assignments = [
@@ -213,9 +456,10 @@ def get_course_assignments(courseID: str) -> dict:
 def get_student_network(studentID: str) -> dict:
     try:
         rows = read(
-            f"MATCH (s:Student {{id:'{studentID}'}})-[:ENROLLED_IN]->(c:Course)"
-            f"<-[:ENROLLED_IN]-(other:Student) "
-            f"RETURN c.id, other.id"
+            "MATCH (s:Student {id: $studentID})-[:ENROLLED_IN]->(c:Course)"
+            "<-[:ENROLLED_IN]-(other:Student) "
+            "RETURN c.id, other.id",
+            {"studentID": studentID}
         )
         network = []
         for row in rows:
@@ -234,11 +478,12 @@ def get_student_network(studentID: str) -> dict:
 def get_student_course_network(studentID: str, courseID: str) -> dict:
     try:
         rows = read(
-            f"MATCH (s:Student {{id:'{studentID}'}})-[:ENROLLED_IN]->(c:Course {{id:'{courseID}'}}) "
-            f"OPTIONAL MATCH (i:Instructor)-[:TEACHES]->(c) "
-            f"OPTIONAL MATCH (other:Student)-[:ENROLLED_IN]->(c) "
-            f"WHERE other.id <> s.id "
-            f"RETURN c.id, collect(DISTINCT i.id), collect(DISTINCT other.id)"
+            "MATCH (s:Student {id: $studentID})-[:ENROLLED_IN]->(c:Course {id: $courseID}) "
+            "OPTIONAL MATCH (i:Instructor)-[:TEACHES]->(c) "
+            "OPTIONAL MATCH (other:Student)-[:ENROLLED_IN]->(c) "
+            "WHERE other.id <> s.id "
+            "RETURN c.id, collect(DISTINCT i.id), collect(DISTINCT other.id)",
+            {"studentID": studentID, "courseID": courseID}
         )
 
         if not rows:
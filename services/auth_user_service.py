@@ -1,25 +1,20 @@
 import uuid
 import bcrypt
-from pymongo import MongoClient
-import redis
+
+from services.connections import get_mongo_db, get_redis
 
 # ----------------------------
 # MongoDB Connection
 # ----------------------------
 
-mongo_client = MongoClient("mongodb://localhost:27017/")
-mongo_db = mongo_client["university_portal"]
+mongo_db = get_mongo_db()
 users_collection = mongo_db["users"]
 
 # ----------------------------
 # Redis Connection
 # ----------------------------
 
-redis_client = redis.Redis(
-    host="localhost",
-    port=6379,
-    decode_responses=True
-)
+redis_client = get_redis()
 
 SESSION_TTL_SECONDS = 600
 
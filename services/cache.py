@@ -0,0 +1,491 @@
+import functools
+import json
+import os
+import random
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from services.connections import get_redis_raw
+
+try:
+    import msgpack
+except ImportError:  # optional: falls back to JSON
+    msgpack = None
+
+
+# ==============================
+# Configuration
+# ==============================
+CACHE_CODEC = os.getenv("CACHE_CODEC", "msgpack" if msgpack else "json")
+CACHE_COMPRESS_THRESHOLD = int(os.getenv("CACHE_COMPRESS_THRESHOLD", "2048"))
+NEGATIVE_TTL = int(os.getenv("CACHE_NEGATIVE_TTL", "30"))
+
+# Single-flight: how long the loader may hold the Redis lock, and how long
+# other callers wait for its result before loading themselves.
+LOCK_TTL_MS = int(os.getenv("CACHE_LOCK_TTL_MS", "10000"))
+LOCK_WAIT_S = float(os.getenv("CACHE_LOCK_WAIT_S", "5"))
+LOCK_POLL_S = 0.05
+
+# In-process tier for hot entries (cached(..., local=True)). Other processes
+# drop their copies through INVALIDATION_CHANNEL; LOCAL_CACHE_TTL bounds how
+# stale a copy can get if a message is missed.
+LOCAL_CACHE_SIZE = int(os.getenv("LOCAL_CACHE_SIZE", "1024"))
+LOCAL_CACHE_TTL = float(os.getenv("LOCAL_CACHE_TTL", "30"))
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Stale-while-revalidate: background threads refreshing stale entries.
+REFRESH_WORKERS = int(os.getenv("CACHE_REFRESH_WORKERS", "1"))
+
+
+# ==============================
+# Codecs
+# ==============================
+# Stored values are framed as <codec tag><compression flag><payload>, so
+# entries written with one codec still decode after CACHE_CODEC changes.
+
+class JsonCodec:
+    tag = b"j"
+
+    @staticmethod
+    def encode(value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+    @staticmethod
+    def decode(data: bytes) -> Any:
+        return json.loads(data)
+
+
+class MsgpackCodec:
+    tag = b"m"
+
+    @staticmethod
+    def encode(value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    @staticmethod
+    def decode(data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+CODECS = {"json": JsonCodec}
+if msgpack is not None:
+    CODECS["msgpack"] = MsgpackCodec
+_CODECS_BY_TAG = {codec.tag: codec for codec in CODECS.values()}
+
+_RAW = b"-"
+_ZLIB = b"z"
+
+
+def encode(value: Any, codec: str = CACHE_CODEC, compress_threshold: int = CACHE_COMPRESS_THRESHOLD) -> bytes:
+    codec_cls = CODECS[codec]
+    payload = codec_cls.encode(value)
+    if compress_threshold is not None and len(payload) > compress_threshold:
+        return codec_cls.tag + _ZLIB + zlib.compress(payload, 1)
+    return codec_cls.tag + _RAW + payload
+
+
+def decode(data: bytes) -> Any:
+    # ValueError for values this module did not write (legacy plain JSON,
+    # a codec that is not installed here, truncated frames).
+    codec_cls = _CODECS_BY_TAG.get(data[:1])
+    if codec_cls is None or data[1:2] not in (_RAW, _ZLIB):
+        raise ValueError(f"Unknown cache frame {data[:2]!r}")
+    payload = data[2:]
+    if data[1:2] == _ZLIB:
+        try:
+            payload = zlib.decompress(payload)
+        except zlib.error as e:
+            raise ValueError(f"Corrupt compressed cache value: {e}") from e
+    return codec_cls.decode(payload)
+
+
+# ==============================
+# Local tier
+# ==============================
+
+class LocalCache:
+    # Size-bounded LRU with a per-entry expiry; values are the decoded objects,
+    # so callers must not mutate what they get back.
+
+    def __init__(self, maxsize: int = LOCAL_CACHE_SIZE, ttl: float = LOCAL_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations
+            }
+
+
+local_cache = LocalCache()
+_subscriber = None
+_subscriber_lock = threading.Lock()
+
+
+def _listen_for_invalidations() -> None:
+    while True:
+        try:
+            pubsub = get_redis_raw().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            # Anything published while we were not subscribed is lost
+            local_cache.clear()
+            for message in pubsub.listen():
+                if message["type"] == "message":
+                    local_cache.discard(json.loads(message["data"]))
+        except Exception:
+            time.sleep(1)
+
+
+def _ensure_subscriber() -> None:
+    global _subscriber
+    if _subscriber is None:
+        with _subscriber_lock:
+            if _subscriber is None:
+                _subscriber = threading.Thread(
+                    target=_listen_for_invalidations, name="cache-invalidation", daemon=True
+                )
+                _subscriber.start()
+
+
+def _publish_invalidation(keys: List[str]) -> None:
+    local_cache.discard(keys)
+    get_redis_raw().publish(INVALIDATION_CHANNEL, json.dumps(keys))
+
+
+def local_stats() -> dict:
+    return local_cache.stats()
+
+
+# ==============================
+# Get / set
+# ==============================
+# SET ... EX in one command; batches and tag bookkeeping go in one pipeline.
+
+def _tag_key(tag: str) -> str:
+    return f"tag:{tag}"
+
+
+def _decode_many(keys: List[str], values: List[Optional[bytes]]) -> List[Optional[Any]]:
+    # Values that do not decode are deleted and read as misses, so the
+    # caller reloads and overwrites them in the current format.
+    decoded = []
+    bad = []
+    for key, data in zip(keys, values):
+        if data is None:
+            decoded.append(None)
+            continue
+        try:
+            decoded.append(decode(data))
+        except ValueError:
+            decoded.append(None)
+            bad.append(key)
+    if bad:
+        get_redis_raw().delete(*bad)
+    return decoded
+
+
+def get(key: str) -> Optional[Any]:
+    return _decode_many([key], [get_redis_raw().get(key)])[0]
+
+
+def get_with_ttl(key: str):
+    # (value, milliseconds left) in one round trip; (None, -2) when missing
+    pipe = get_redis_raw().pipeline(transaction=False)
+    pipe.get(key)
+    pipe.pttl(key)
+    data, ttl_ms = pipe.execute()
+    value = _decode_many([key], [data])[0]
+    return value, (ttl_ms if value is not None or data is None else -2)
+
+
+def get_many(keys: List[str]) -> List[Optional[Any]]:
+    if not keys:
+        return []
+    return _decode_many(keys, get_redis_raw().mget(keys))
+
+
+def set_value(key: str, value: Any, ttl: int, tags: Iterable[str] = ()) -> None:
+    set_many({key: value}, ttl, tags)
+
+
+def set_many(items: Dict[str, Any], ttl: int, tags: Iterable[str] = ()) -> None:
+    # Every key in `items` is registered under every tag.
+    if not items:
+        return
+    pipe = get_redis_raw().pipeline(transaction=False)
+    for key, value in items.items():
+        pipe.set(key, encode(value), ex=ttl)
+    for tag in tags:
+        # A tag must outlive its longest-lived key: set the TTL if it has
+        # none, otherwise only ever extend it (Redis >= 7.0).
+        pipe.sadd(_tag_key(tag), *items)
+        pipe.expire(_tag_key(tag), ttl, nx=True)
+        pipe.expire(_tag_key(tag), ttl, gt=True)
+    pipe.execute()
+
+
+def update_many(updates: Dict[str, Callable[[Any], Any]], delete_keys: Iterable[str] = (),
+                also: Optional[Callable[[Any], None]] = None) -> List[str]:
+    """
+    Write-through: rewrites cached values in place in one WATCH/MULTI
+    transaction. Each updater gets the cached value and returns the new one;
+    keys that are not cached stay missing (the next read loads them) and
+    updated keys keep their TTL. also(pipe) queues extra commands in the
+    same transaction. Returns the keys that were rewritten.
+    """
+    keys = list(updates)
+    delete_keys = list(delete_keys)
+    changed = []
+
+    def apply(pipe):
+        changed.clear()
+        values = pipe.mget(keys) if keys else []
+        pipe.multi()
+        unreadable = []
+        for key, data in zip(keys, values):
+            if data is None:
+                continue
+            try:
+                current = decode(data)
+            except ValueError:
+                unreadable.append(key)
+                continue
+            pipe.set(key, encode(updates[key](current)), keepttl=True)
+            changed.append(key)
+        if delete_keys or unreadable:
+            pipe.delete(*delete_keys, *unreadable)
+        if also:
+            also(pipe)
+        if changed or delete_keys:
+            pipe.publish(INVALIDATION_CHANNEL, json.dumps(changed + delete_keys))
+
+    get_redis_raw().transaction(apply, *keys)
+    local_cache.discard(keys + delete_keys)
+    return changed
+
+
+def delete(*keys: str) -> int:
+    if not keys:
+        return 0
+    deleted = get_redis_raw().delete(*keys)
+    _publish_invalidation(list(keys))
+    return deleted
+
+
+def invalidate_tag(tag: str) -> int:
+    client = get_redis_raw()
+    tag_key = _tag_key(tag)
+    keys = list(client.smembers(tag_key))
+    if not keys:
+        return 0
+    # SREM rather than DEL on the tag, so keys tagged meanwhile stay tracked
+    pipe = client.pipeline()
+    pipe.delete(*keys)
+    pipe.srem(tag_key, *keys)
+    pipe.publish(INVALIDATION_CHANNEL, json.dumps([k.decode("utf-8") for k in keys]))
+    deleted = pipe.execute()[0]
+    local_cache.discard(k.decode("utf-8") for k in keys)
+    return deleted
+
+
+# ==============================
+# Read-through decorator
+# ==============================
+
+_RELEASE_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+_flights_lock = threading.Lock()
+_flights = {}  # key -> [threading.Lock, callers]
+
+
+def _single_flight(key: str, load: Callable[[], Any]) -> Any:
+    # One loader per key: threads of this process queue on a local lock,
+    # other processes wait on lock:{key} in Redis and read what it stored.
+    with _flights_lock:
+        flight = _flights.setdefault(key, [threading.Lock(), 0])
+        flight[1] += 1
+    try:
+        with flight[0]:
+            value = get(key)
+            if value is not None:
+                return value
+
+            client = get_redis_raw()
+            lock_key = f"lock:{key}"
+            token = uuid.uuid4().hex
+            if client.set(lock_key, token, nx=True, px=LOCK_TTL_MS):
+                try:
+                    return load()
+                finally:
+                    client.eval(_RELEASE_LOCK, 1, lock_key, token)
+
+            deadline = time.monotonic() + LOCK_WAIT_S
+            while time.monotonic() < deadline:
+                time.sleep(LOCK_POLL_S)
+                value = get(key)
+                if value is not None:
+                    return value
+                if not client.exists(lock_key):
+                    break
+            return load()
+    finally:
+        with _flights_lock:
+            flight[1] -= 1
+            if flight[1] == 0:
+                _flights.pop(key, None)
+
+
+_refresh_pool = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix="cache-refresh")
+_refreshing_lock = threading.Lock()
+_refreshing = {}  # keys with a refresh queued or running
+
+
+def _refresh(key: str, load: Callable[[], Any]) -> None:
+    # Only one process refreshes a key; the rest keep serving the stale value.
+    client = get_redis_raw()
+    lock_key = f"lock:{key}"
+    token = uuid.uuid4().hex
+    try:
+        if client.set(lock_key, token, nx=True, px=LOCK_TTL_MS):
+            try:
+                load()
+            finally:
+                client.eval(_RELEASE_LOCK, 1, lock_key, token)
+    except Exception:
+        pass  # the entry still expires on its own
+    finally:
+        with _refreshing_lock:
+            _refreshing.pop(key, None)
+
+
+def _revalidate(key: str, load: Callable[[], Any]) -> None:
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing[key] = True
+    _refresh_pool.submit(_refresh, key, load)
+
+
+def jittered(ttl: int, jitter: float) -> int:
+    # ttl +/- jitter*ttl, so entries written together don't expire together
+    if not jitter:
+        return ttl
+    return max(1, int(ttl * (1 + random.uniform(-jitter, jitter))))
+
+
+def is_negative(result: Any) -> bool:
+    # Empty results and {"success": False, ...} are cached for NEGATIVE_TTL only
+    if isinstance(result, dict) and result.get("success") is False:
+        return True
+    return not result
+
+
+def cached(key: Callable[..., str], ttl: int, tags: Optional[Callable[..., List[str]]] = None,
+           negative_ttl: int = NEGATIVE_TTL, local: bool = False, jitter: float = 0.0, stale: int = 0):
+    """
+    key(*args, **kwargs) -> cache key
+    tags(result, *args, **kwargs) -> tags to register the key under
+    local: also keep the value in this process's LRU tier
+    jitter: fraction of ttl added or removed at random per entry
+    stale: seconds an expired entry is still served while one background
+    worker reloads it (the Redis TTL is ttl + stale)
+    The undecorated function stays available as .uncached.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            if local:
+                _ensure_subscriber()
+                value = local_cache.get(cache_key)
+                if value is not None:
+                    return value
+
+            def load():
+                result = fn(*args, **kwargs)
+                if result is not None:
+                    set_value(
+                        cache_key,
+                        result,
+                        negative_ttl if is_negative(result) else jittered(ttl, jitter) + stale,
+                        tags(result, *args, **kwargs) if tags else ()
+                    )
+                return result
+
+            if stale:
+                value, ttl_ms = get_with_ttl(cache_key)
+                # negative entries are short-lived anyway; let them expire
+                if value is not None and 0 <= ttl_ms < stale * 1000 and not is_negative(value):
+                    _revalidate(cache_key, load)
+            else:
+                value = get(cache_key)
+            if value is None:
+                value = _single_flight(cache_key, load)
+
+            if local and value is not None:
+                local_cache.set(cache_key, value, negative_ttl if is_negative(value) else ttl)
+            return value
+
+        wrapper.uncached = fn
+        return wrapper
+    return decorator
@@ -0,0 +1,131 @@
+import os
+import threading
+
+from pymongo import MongoClient
+import redis
+from neo4j import GraphDatabase
+
+
+# ==============================
+# Configuration (override with environment variables)
+# ==============================
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "university_portal")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_TIMEOUT_MS = int(os.getenv("MONGO_TIMEOUT_MS", "5000"))
+
+REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+REDIS_DB = int(os.getenv("REDIS_DB", "0"))
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_TIMEOUT_S = float(os.getenv("REDIS_TIMEOUT_S", "5"))
+
+NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
+NEO4J_PASS = os.getenv("NEO4J_PASS", "test1234")
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+NEO4J_TIMEOUT_S = float(os.getenv("NEO4J_TIMEOUT_S", "5"))
+
+
+# ==============================
+# Lazily created, process-wide clients
+# None of these open a socket until the first query, so importing a
+# service never blocks on (or fails because of) a backend being down.
+# ==============================
+_lock = threading.Lock()
+_mongo_client = None
+_redis_pool = None
+_redis_client = None
+_redis_raw_pool = None
+_redis_raw_client = None
+_neo4j_driver = None
+
+
+def get_mongo_client() -> MongoClient:
+    global _mongo_client
+    if _mongo_client is None:
+        with _lock:
+            if _mongo_client is None:
+                _mongo_client = MongoClient(
+                    MONGO_URI,
+                    maxPoolSize=MONGO_MAX_POOL_SIZE,
+                    minPoolSize=MONGO_MIN_POOL_SIZE,
+                    serverSelectionTimeoutMS=MONGO_TIMEOUT_MS,
+                    connectTimeoutMS=MONGO_TIMEOUT_MS,
+                    connect=False,
+                )
+    return _mongo_client
+
+
+def get_mongo_db():
+    return get_mongo_client()[MONGO_DB_NAME]
+
+
+def get_redis() -> redis.Redis:
+    global _redis_pool, _redis_client
+    if _redis_client is None:
+        with _lock:
+            if _redis_client is None:
+                _redis_pool = redis.ConnectionPool(
+                    host=REDIS_HOST,
+                    port=REDIS_PORT,
+                    db=REDIS_DB,
+                    max_connections=REDIS_MAX_CONNECTIONS,
+                    socket_timeout=REDIS_TIMEOUT_S,
+                    socket_connect_timeout=REDIS_TIMEOUT_S,
+                    decode_responses=True,
+                )
+                _redis_client = redis.Redis(connection_pool=_redis_pool)
+    return _redis_client
+
+
+def get_redis_raw() -> redis.Redis:
+    # bytes in/bytes out client for the binary cache codecs (services/cache.py)
+    global _redis_raw_pool, _redis_raw_client
+    if _redis_raw_client is None:
+        with _lock:
+            if _redis_raw_client is None:
+                _redis_raw_pool = redis.ConnectionPool(
+                    host=REDIS_HOST,
+                    port=REDIS_PORT,
+                    db=REDIS_DB,
+                    max_connections=REDIS_MAX_CONNECTIONS,
+                    socket_timeout=REDIS_TIMEOUT_S,
+                    socket_connect_timeout=REDIS_TIMEOUT_S,
+                )
+                _redis_raw_client = redis.Redis(connection_pool=_redis_raw_pool)
+    return _redis_raw_client
+
+
+def get_neo4j_driver():
+    global _neo4j_driver
+    if _neo4j_driver is None:
+        with _lock:
+            if _neo4j_driver is None:
+                _neo4j_driver = GraphDatabase.driver(
+                    NEO4J_URI,
+                    auth=(NEO4J_USER, NEO4J_PASS),
+                    max_connection_pool_size=NEO4J_MAX_POOL_SIZE,
+                    connection_timeout=NEO4J_TIMEOUT_S,
+                )
+    return _neo4j_driver
+
+
+def close_all() -> None:
+    global _mongo_client, _redis_pool, _redis_client, _redis_raw_pool, _redis_raw_client, _neo4j_driver
+    with _lock:
+        if _mongo_client is not None:
+            _mongo_client.close()
+        if _redis_pool is not None:
+            _redis_pool.disconnect()
+        if _redis_raw_pool is not None:
+            _redis_raw_pool.disconnect()
+        if _neo4j_driver is not None:
+            _neo4j_driver.close()
+        _mongo_client = None
+        _redis_pool = None
+        _redis_client = None
+        _redis_raw_pool = None
+        _redis_raw_client = None
+        _neo4j_driver = None
@@ -1,18 +1,22 @@
 from typing import Any, List, Optional
-import redis
-from pymongo import MongoClient
+from pymongo import UpdateOne
 from pymongo.collection import Collection
 from pymongo.errors import PyMongoError
+import csv
+import hashlib
 import json
 
-from services.academic_network_service import get_course_students
+from services import cache
+from services.academic_network_service import get_course_assignments, get_course_students, get_instructor_courses_ids, get_student_enrolled_course_ids
+from services.connections import get_mongo_db, get_redis
+from services.student_information_service import get_course_catalogue, get_course_details, get_courses, get_seat_counts
 
-mongo_client = MongoClient("mongodb://localhost:27017/")
-mongo_db = mongo_client["university_portal"]
+mongo_db = get_mongo_db()
 assignments_col: Collection = mongo_db["assignments"]
 courses_col = mongo_db["courses"]
-assignments_col.create_index([("assignment_id", 1)], unique=True)
-redis_client = redis.Redis(host="localhost", port=6379, decode_responses=True)
+submissions_col = mongo_db["submissions"]
+redis_client = get_redis()
+_indexes_ready = False
 
 DEFAULT_CACHE_TTL = 600 
 
@@ -22,8 +26,15 @@ DEFAULT_CACHE_TTL = 600
 def _k_instructor_courses(instructor_id: str) -> str:
     return f"instructor_courses:{instructor_id}"
 
-def _k_available_courses(student_id: str) -> str:
-    return f"available_courses:{student_id}"
+def _k_catalogue_version() -> str:
+    return "catalogue:version"
+
+def _k_catalogue_page(version: int, after: Optional[str], filters: dict) -> str:
+    digest = hashlib.sha1(json.dumps(filters, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return f"catalogue:v{version}:{after or ''}:{digest}"
+
+def _k_student_enrolled(student_id: str) -> str:
+    return f"student_enrolled:{student_id}"
 
 def _k_instructor_course_assignments(instructor_id: str) -> str:
     return f"instructor_course_assignments:{instructor_id}"
@@ -43,176 +54,312 @@ def _k_student_course_details(student_id: str, course_id: str) -> str:
 def _k_pending_tasks(student_id: str) -> str:
     return f"pending_tasks:{student_id}"
 
+# Tags (see services/cache.py): cache keys registered under e.g.
+# "course_details:{course_id}" when written, so invalidation deletes exactly
+# those keys without scanning.
+def _tag_course_details(course_id: str) -> str:
+    return f"course_details:{course_id}"
+
+def _tag_pending_tasks(course_id: str) -> str:
+    return f"pending_tasks:{course_id}"
+
+
+def invalidate_tag(tag: str) -> dict:
+    return {"success": True, "deleted_keys": cache.invalidate_tag(tag)}
+
 
 # Redis Invalidation Functions
 
 def invalidate_instructor_courses_cache(instructorID: str) -> dict:
-    redis_client.delete(_k_instructor_courses(instructorID))
+    cache.delete(_k_instructor_courses(instructorID))
     return {"success": True}
 
 def invalidate_available_courses_cache() -> dict:
-    keys = redis_client.keys("available_courses:*")
-    if keys:
-        redis_client.delete(*keys)
-    return {"success": True, "deleted_keys": len(keys)}
+    # Pages of older versions are never read again and expire on their TTL.
+    version = redis_client.incr(_k_catalogue_version())
+    return {"success": True, "version": version}
 
 def invalidate_course_details_cache(courseID: str) -> dict:
-    pattern = _k_student_course_details("*", courseID)
-
-    cursor = 0
-    deleted = 0
-
-    while True:
-        cursor, keys = redis_client.scan(cursor=cursor, match=pattern)
-        if keys:
-            redis_client.delete(*keys)
-            deleted += len(keys)
-
-        if cursor == 0:
-            break
-
-    return {
-        "success": True,
-        "deleted_keys": deleted
-    }
+    return invalidate_tag(_tag_course_details(courseID))
 
 def invalidate_student_available_courses_cache(student_id) -> dict:
-    redis_client.delete(_k_available_courses(student_id)) 
+    redis_client.delete(_k_student_enrolled(student_id))
     return {"success": True}
 
 def invalidate_instructor_course_assignments_cache(courseID: str) -> dict:
-    redis_client.delete(_k_course_assignments(courseID))
+    cache.delete(_k_course_assignments(courseID))
     return {"success": True}
 
 def invalidate_student_course_details_cache(studentID: str, courseID: str) -> dict:
-    redis_client.delete(_k_student_course_details(studentID, courseID))
+    cache.delete(_k_student_course_details(studentID, courseID))
     return {"success": True}
 
+def invalidate_course_details_cache_for_students(studentIDs: List[str], courseID: str) -> dict:
+    keys = [_k_student_course_details(student_id, courseID) for student_id in studentIDs]
+    if keys:
+        cache.delete(*keys)
+    return {"success": True, "deleted_keys": len(keys)}
+
 def invalidate_enrolled_students_cache(courseID: str) -> dict:
-    redis_client.delete(_k_enrolled_students(courseID))
+    cache.delete(_k_enrolled_students(courseID))
     return {"success": True}
 
 def invalidate_student_courses_cache(studentID: str) -> dict:
-    redis_client.delete(_k_student_courses(studentID))
+    cache.delete(_k_student_courses(studentID))
     return {"success": True}
 
 def invalidate_student_pending_task_cache(studentID: str) -> dict:
-    redis_client.delete(_k_pending_tasks(studentID))
+    cache.delete(_k_pending_tasks(studentID))
     return {"success": True}
 
 def invalidate_pending_tasks_cache_for_course(courseID: str):
-    try:
-        enrolled_students = get_course_students(courseID)
-        students = enrolled_students.get("students", [])
-
-        for student in students:
-            student_id = student["studentID"]
-            key = _k_pending_tasks(student_id)
-            redis_client.delete(key) 
-
-        return {"success": True}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+    return invalidate_tag(_tag_pending_tasks(courseID))
 
 # Redis Cache Functions
+# Read-through loaders: return the cached value or load, cache and return it
+# (see services/cache.py for negative caching and single-flight).
+
+# Per key family: ttl (seconds), jitter (fraction of ttl, +/-) so entries
+# cached in the same burst expire spread out, and stale (seconds an expired
+# entry is still served while it is refreshed in the background).
+DEFAULT_CACHE_JITTER = 0.2
+
+CACHE_POLICIES = {
+    "instructor_courses": {"ttl": DEFAULT_CACHE_TTL, "jitter": DEFAULT_CACHE_JITTER, "stale": 120},
+    "course_assignments": {"ttl": DEFAULT_CACHE_TTL, "jitter": DEFAULT_CACHE_JITTER, "stale": 120},
+    "enrolled_students": {"ttl": DEFAULT_CACHE_TTL, "jitter": DEFAULT_CACHE_JITTER, "stale": 120},
+    "student_courses": {"ttl": DEFAULT_CACHE_TTL, "jitter": DEFAULT_CACHE_JITTER, "stale": 120},
+    "course_details": {"ttl": DEFAULT_CACHE_TTL, "jitter": DEFAULT_CACHE_JITTER, "stale": 120},
+    "pending_tasks": {"ttl": 300, "jitter": DEFAULT_CACHE_JITTER, "stale": 60},
+    "catalogue": {"ttl": 300, "jitter": DEFAULT_CACHE_JITTER, "stale": 60},
+}
+
+
+def get_catalogue_version() -> int:
+    return int(redis_client.get(_k_catalogue_version()) or 0)
+
+
+@cache.cached(key=_k_instructor_courses, **CACHE_POLICIES["instructor_courses"], local=True)
+def load_instructor_courses(instructorID: str) -> List[dict]:
+    return get_courses(get_instructor_courses_ids(instructorID))
+
+
+@cache.cached(key=_k_course_assignments, **CACHE_POLICIES["course_assignments"], local=True)
+def load_course_assignments(courseID: str) -> dict:
+    return get_course_assignments(courseID)
+
+
+@cache.cached(key=_k_enrolled_students, **CACHE_POLICIES["enrolled_students"], local=True)
+def load_enrolled_students(courseID: str) -> dict:
+    return get_course_students(courseID)
+
+
+@cache.cached(key=_k_student_courses, **CACHE_POLICIES["student_courses"], local=True)
+def load_student_courses(studentID: str) -> List[dict]:
+    return get_courses(get_student_enrolled_course_ids(studentID))
+
+
+@cache.cached(
+    key=_k_student_course_details,
+    **CACHE_POLICIES["course_details"],
+    tags=lambda result, studentID, courseID: [_tag_course_details(courseID)],
+    local=True
+)
+def load_course_details(studentID: str, courseID: str) -> dict:
+    return get_course_details(courseID, studentID)
+
+
+@cache.cached(
+    key=_k_pending_tasks,
+    **CACHE_POLICIES["pending_tasks"],
+    tags=lambda result, studentID: [_tag_pending_tasks(c) for c in result.get("course_ids", [])]
+)
+def load_pending_tasks(studentID: str) -> dict:
+    courseIDs = get_student_enrolled_course_ids(studentID)
+    result = get_pending_assignments_for_courses(studentID, courseIDs)
+    result["course_ids"] = courseIDs
+    return result
+
+
+# Shared by every student; the key carries the catalogue version read before
+# the query, so a page built while the dean bumps the version is filed under
+# the old (dead) version.
+@cache.cached(
+    key=lambda after=None, filters=None: _k_catalogue_page(get_catalogue_version(), after, filters or {}),
+    **CACHE_POLICIES["catalogue"],
+    local=True
+)
+def _load_catalogue_listing(after: Optional[str] = None, filters: Optional[dict] = None) -> dict:
+    return get_course_catalogue(after=after, **(filters or {}))
+
+
+# Seat counts move with every enrollment, so they are read live on top of the
+# shared page; pages filtered on free seats are not shared at all.
+def load_catalogue_page(after: Optional[str] = None, filters: Optional[dict] = None) -> dict:
+    filters = filters or {}
+    if filters.get("free_seats_only"):
+        return get_course_catalogue(after=after, **filters)
+    page = _load_catalogue_listing(after, filters)
+    if not page["success"]:
+        return page
+    counts = get_seat_counts([c["course_id"] for c in page["courses"]])
+    return {
+        **page,
+        "courses": [
+            {**c, "details": {
+                **c["details"],
+                "registered_students_count": counts.get(
+                    c["course_id"], c["details"].get("registered_students_count", 0)
+                )
+            }}
+            for c in page["courses"]
+        ]
+    }
 
-def cache_instructor_courses(instructorID: str, courses: List[dict]) -> dict:
-    key = _k_instructor_courses(instructorID)
-    redis_client.set(key, json.dumps(courses))
-    redis_client.expire(key, DEFAULT_CACHE_TTL)
-    return {"success": True}
-
-def cache_course_assignments(courseID: str, assignments: List[dict]) -> dict:
-    key = _k_course_assignments(courseID)
-    redis_client.set(key, json.dumps(assignments))
-    redis_client.expire(key, DEFAULT_CACHE_TTL)
-    return {"success": True}
 
-def cache_enrolled_students(courseID: str, students: List[dict]) -> dict:
-    key = _k_enrolled_students(courseID)
-    redis_client.set(key, json.dumps(students))
-    redis_client.expire(key, DEFAULT_CACHE_TTL)
-    return {"success": True}
+# Set members are course ids plus a "" member marking a complete set (so an
+# empty set can be cached, and a set created by record_enrollment's SADD
+# alone is not mistaken for one).
+def load_student_enrolled_ids(studentID: str) -> set:
+    key = _k_student_enrolled(studentID)
+    members = redis_client.smembers(key)
+    if "" in members:
+        members.discard("")
+        return members
+
+    courseIDs = get_student_enrolled_course_ids(studentID)
+    pipe = redis_client.pipeline()
+    pipe.delete(key)
+    pipe.sadd(key, "", *courseIDs)
+    pipe.expire(key, cache.jittered(DEFAULT_CACHE_TTL, DEFAULT_CACHE_JITTER))
+    pipe.execute()
+    return set(courseIDs)
+
+
+# Write-through updates
+# Applied after the database write succeeded, so the next screen is a hit.
+
+def record_enrollment(studentID: str, studentName: str, course: dict) -> dict:
+    courseID = course["course_id"]
+
+    def add_course(courses):
+        if any(c.get("course_id") == courseID for c in courses):
+            return courses
+        return courses + [course]
+
+    def add_student(enrolled):
+        students = enrolled.get("students")
+        if students is None or any(s["studentID"] == studentID for s in students):
+            return enrolled
+        return {**enrolled, "students": students + [{"studentID": studentID, "studentName": studentName}]}
+
+    enrolled_key = _k_student_enrolled(studentID)
+
+    def add_enrolled_id(pipe):
+        pipe.sadd(enrolled_key, courseID)
+        pipe.expire(enrolled_key, DEFAULT_CACHE_TTL, nx=True)
+
+    updated = cache.update_many(
+        {
+            _k_student_courses(studentID): add_course,
+            _k_enrolled_students(courseID): add_student
+        },
+        # The new course's assignments are not in the cached list
+        delete_keys=[_k_pending_tasks(studentID)],
+        also=add_enrolled_id
+    )
+    return {"success": True, "updated_keys": updated}
 
-def cache_available_courses(studentID: str, courses: List[dict]) -> dict:
-    key = _k_available_courses(studentID)
-    redis_client.set(key, json.dumps(courses))
-    redis_client.expire(key, DEFAULT_CACHE_TTL)
-    return {"success": True}
 
-def cache_student_courses(studentID: str, courses: List[dict]) -> dict:
-    key = _k_student_courses(studentID)
-    redis_client.set(key, json.dumps(courses))
-    redis_client.expire(key, DEFAULT_CACHE_TTL)
-    return {"success": True}
+def record_submission(studentID: str, courseID: str, assignmentID: str, answerText: str) -> dict:
+    def drop_pending(pending):
+        if "tasks" not in pending:
+            return pending
+        return {**pending, "tasks": [t for t in pending.get("tasks", []) if t["assignment_id"] != assignmentID]}
 
-def cache_student_course_details(studentID: str, courseID: str, courseDetails: dict) -> dict:
-    key = _k_student_course_details(studentID, courseID)
-    redis_client.set(key, json.dumps(courseDetails))
-    redis_client.expire(key, DEFAULT_CACHE_TTL)
-    return {"success": True}
+    def complete_task(details):
+        if "pending_tasks" not in details:
+            return details
+        submitted = [t for t in details["pending_tasks"] if t["assignment_id"] == assignmentID]
+        return {
+            **details,
+            "pending_tasks": [t for t in details["pending_tasks"] if t["assignment_id"] != assignmentID],
+            "completed_tasks": details.get("completed_tasks", []) + [
+                {**t, "answer": answerText} for t in submitted
+            ]
+        }
 
-def cache_pending_tasks(studentID: str, tasks: List[dict]) -> dict:
-    key = _k_pending_tasks(studentID)
-    redis_client.set(key, json.dumps(tasks))
-    redis_client.expire(key, DEFAULT_CACHE_TTL)
-    return {"success": True}
+    updated = cache.update_many({
+        _k_pending_tasks(studentID): drop_pending,
+        _k_student_course_details(studentID, courseID): complete_task
+    })
+    return {"success": True, "updated_keys": updated}
 
 
-import json
-from typing import List, Optional
-
-def get_cached_instructor_courses(instructorID: str) -> Optional[List[dict]]:
-    key = _k_instructor_courses(instructorID)
-    data = redis_client.get(key)
-    if not data:
-        return None
-    return json.loads(data)
-
-def get_cached_course_assignments(courseID: str) -> Optional[List[dict]]:
-    key = _k_course_assignments(courseID)
-    data = redis_client.get(key)
-    if not data:
-        return None
-    return json.loads(data)
-
-def get_cached_enrolled_students(courseID: str) -> Optional[List[dict]]:
-    key = _k_enrolled_students(courseID)
-    data = redis_client.get(key)
-    if not data:
-        return None
-    return json.loads(data)
-
-def get_cached_available_courses(studentID: str) -> Optional[List[dict]]:
-    key = _k_available_courses(studentID)
-    data = redis_client.get(key)
-    if not data:
-        return None
-    return json.loads(data)
-
-def get_cached_student_courses(studentID: str) -> Optional[List[dict]]:
-    key = _k_student_courses(studentID)
-    data = redis_client.get(key)
-    if not data:
-        return None
-    return json.loads(data)
-
-def get_cached_student_course_details(studentID: str, courseID: str) -> Optional[dict]:
-    key = _k_student_course_details(studentID, courseID)
-    data = redis_client.get(key)
-    if not data:
-        return None
-    return json.loads(data)
-
-def get_cached_pending_tasks(studentID: str) -> Optional[List[dict]]:
-    key = _k_pending_tasks(studentID)
-    data = redis_client.get(key)
-    if not data:
-        return None
-    return json.loads(data)
+# MongoDB Functions
 
+def ensure_indexes(force: bool = False) -> None:
+    global _indexes_ready
+    if _indexes_ready and not force:
+        return
+    assignments_col.create_index([("assignment_id", 1)], unique=True)
+    assignments_col.create_index([("course_id", 1)])
+    # One document per (assignment, student): answer text and grade
+    submissions_col.create_index([("assignment_id", 1), ("student_id", 1)], unique=True)
+    submissions_col.create_index([("student_id", 1), ("assignment_id", 1)])
+    _indexes_ready = True
+
+
+def _fill_missing(field: str, value: Any) -> list:
+    # Update pipeline that sets `field` only when the submission lacks it, so
+    # answers/grades written since the switch are never overwritten.
+    return [{"$set": {field: {"$ifNull": ["$" + field, {"$literal": value}]}}}]
+
+
+# Moves answers/grades from the old embedded answer_text/grades arrays into
+# submissions. Run from setup_schema (admin_tools), not on the request path.
+def migrate_embedded_submissions(batch_size: int = 1000) -> dict:
+    ensure_indexes()
+    cursor = assignments_col.find(
+        {"$or": [{"answer_text": {"$exists": True}}, {"grades": {"$exists": True}}]},
+        {"_id": 0, "assignment_id": 1, "answer_text": 1, "grades": 1}
+    )
+    ops = []
+    migrated_assignments = []
+    upserted = 0
+
+    def flush():
+        nonlocal ops, upserted
+        if ops:
+            result = submissions_col.bulk_write(ops, ordered=False)
+            upserted += result.upserted_count + result.modified_count
+            ops = []
+
+    for a in cursor:
+        for ans in a.get("answer_text", []):
+            ops.append(UpdateOne(
+                {"assignment_id": a["assignment_id"], "student_id": ans["student_id"]},
+                _fill_missing("text", ans.get("text")),
+                upsert=True
+            ))
+        for g in a.get("grades", []):
+            ops.append(UpdateOne(
+                {"assignment_id": a["assignment_id"], "student_id": g["student_id"]},
+                _fill_missing("grade", g.get("grade")),
+                upsert=True
+            ))
+        migrated_assignments.append(a["assignment_id"])
+        if len(ops) >= batch_size:
+            flush()
+    flush()
+
+    if migrated_assignments:
+        assignments_col.update_many(
+            {"assignment_id": {"$in": migrated_assignments}},
+            {"$unset": {"answer_text": "", "grades": ""}}
+        )
+    return {"success": True, "assignments": len(migrated_assignments), "submissions": upserted}
 
-# MongoDB Functions
 
 def create_assignment(courseID: str, assignmentData: dict) -> dict:
     """
@@ -224,11 +371,10 @@ def create_assignment(courseID: str, assignmentData: dict) -> dict:
     - max_grade
     """
     try:
+        ensure_indexes()
         doc = {
             "course_id": courseID,
-            **assignmentData,
-            "grades": [],
-            "answer_text": []
+            **assignmentData
         }
         assignments_col.insert_one(doc)
         return {"success": True}
@@ -239,23 +385,19 @@ def create_assignment(courseID: str, assignmentData: dict) -> dict:
 def get_answer(studentID: str, assignmentID: str) -> dict:
     assignment = assignments_col.find_one(
         {"assignment_id": assignmentID},
-        {"_id": 0, "answer_text": 1, "max_grade": 1, "grades": 1}  # أضفنا grades
+        {"_id": 0, "max_grade": 1}
     )
 
     if not assignment:
         return {"success": False, "answer": None, "grade": None}
 
-    student_answer = None
-    for ans in assignment.get("answer_text", []):
-        if ans["student_id"] == studentID:
-            student_answer = ans["text"]
-            break
+    submission = submissions_col.find_one(
+        {"assignment_id": assignmentID, "student_id": studentID},
+        {"_id": 0, "text": 1, "grade": 1}
+    ) or {}
 
-    student_grade = None
-    for g in assignment.get("grades", []):
-        if g["student_id"] == studentID:
-            student_grade = g["grade"]
-            break
+    student_answer = submission.get("text")
+    student_grade = submission.get("grade")
 
     if student_answer is not None or student_grade is not None:
         return {
@@ -271,14 +413,11 @@ def get_answer(studentID: str, assignmentID: str) -> dict:
 
 def update_grades(assignmentID: str, studentID: str, grade: Any) -> dict:
     try:
-        assignments_col.update_one(
-            {"assignment_id": assignmentID},
-            {"$pull": {"grades": {"student_id": studentID}}}
-        )
-
-        assignments_col.update_one(
-            {"assignment_id": assignmentID},
-            {"$push": {"grades": {"student_id": studentID, "grade": grade}}}
+        ensure_indexes()
+        submissions_col.update_one(
+            {"assignment_id": assignmentID, "student_id": studentID},
+            {"$set": {"grade": grade}},
+            upsert=True
         )
 
         return {"success": True}
@@ -286,6 +425,28 @@ def update_grades(assignmentID: str, studentID: str, grade: Any) -> dict:
         return {"success": False, "error": str(e)}
 
 
+def update_grades_bulk(assignmentID: str, grades: dict) -> dict:
+    """
+    grades maps student_id -> grade for one assignment; applied in one bulk_write.
+    """
+    if not grades:
+        return {"success": True, "matched": 0, "upserted": 0}
+    try:
+        ensure_indexes()
+        result = submissions_col.bulk_write([
+            UpdateOne(
+                {"assignment_id": assignmentID, "student_id": studentID},
+                {"$set": {"grade": grade}},
+                upsert=True
+            )
+            for studentID, grade in grades.items()
+        ], ordered=False)
+
+        return {"success": True, "matched": result.matched_count, "upserted": result.upserted_count}
+    except PyMongoError as e:
+        return {"success": False, "error": str(e)}
+
+
 def create_answer_document(studentID: str, assignmentID: str, answerData: dict) -> dict:
     """
     answerData must include:
@@ -293,19 +454,11 @@ def create_answer_document(studentID: str, assignmentID: str, answerData: dict)
     - text
     """
     try:
-        assignments_col.update_one(
-            {"assignment_id": assignmentID},
-            {"$pull": {"answer_text": {"student_id": studentID}}}
-        )
-
-        assignments_col.update_one(
-            {"assignment_id": assignmentID},
-            {"$push": {
-                "answer_text": {
-                    "student_id": studentID,
-                    "text": answerData["text"]
-                }
-            }}
+        ensure_indexes()
+        submissions_col.update_one(
+            {"assignment_id": assignmentID, "student_id": studentID},
+            {"$set": {"text": answerData["text"]}},
+            upsert=True
         )
 
         return {"success": True}
@@ -313,34 +466,74 @@ def create_answer_document(studentID: str, assignmentID: str, answerData: dict)
         return {"success": False, "error": str(e)}
 
 
-def get_pending_assignments_for_courses(studentID: str, courseIDs: List[str]) -> dict:
+def get_assignment_submissions(assignmentID: str, studentIDs: List[str]) -> dict:
+    # student_id -> {"text", "grade"} for every listed student who has a submission
     try:
-        assignments = list(assignments_col.find(
-            {"course_id": {"$in": courseIDs}},
-            {"_id": 0, "assignment_id": 1, "course_id": 1, "title": 1, "description": 1, "deadline": 1, "max_grade": 1, "answer_text": 1}
-        ))
-
-        pending = []
-
-        for a in assignments:
-            submitted_students = {ans["student_id"] for ans in a.get("answer_text", [])}
-            if studentID not in submitted_students:
-                course = courses_col.find_one(
-                    {"course_id": a["course_id"]},
-                    {"_id": 0, "details.course_name": 1} 
-                )
-                course_name = course["details"]["course_name"] if course and "details" in course else "Unknown Course"
+        submissions = {
+            sub.pop("student_id"): sub
+            for sub in submissions_col.find(
+                {"assignment_id": assignmentID, "student_id": {"$in": studentIDs}},
+                {"_id": 0, "student_id": 1, "text": 1, "grade": 1}
+            )
+        }
+        return {"success": True, "submissions": submissions}
+    except PyMongoError as e:
+        return {"success": False, "error": str(e)}
 
-                pending.append({
-                    "course_name": course_name,
-                    "assignment_id": a["assignment_id"],
-                    "title": a["title"],
-                    "description": a["description"],
-                    "deadline": a["deadline"],
-                    "max_grade": a["max_grade"]
-                })
+
+def load_grades_csv(path: str) -> dict:
+    """
+    CSV columns: student_id, grade
+    """
+    grades = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            student_id = (row.get("student_id") or "").strip()
+            grade = (row.get("grade") or "").strip()
+            if student_id and grade:
+                grades[student_id] = grade
+    return grades
+
+
+def get_pending_assignments_for_courses(studentID: str, courseIDs: List[str]) -> dict:
+    # One round trip: answered assignments are dropped by the submissions
+    # lookup and course names come from a lookup on courses.
+    try:
+        pending = list(assignments_col.aggregate([
+            {"$match": {"course_id": {"$in": courseIDs}}},
+            {"$lookup": {
+                "from": "submissions",
+                "localField": "assignment_id",
+                "foreignField": "assignment_id",
+                "pipeline": [
+                    {"$match": {"student_id": studentID, "text": {"$exists": True}}},
+                    {"$limit": 1},
+                    {"$project": {"_id": 1}}
+                ],
+                "as": "submitted"
+            }},
+            {"$match": {"submitted": []}},
+            {"$lookup": {
+                "from": "courses",
+                "localField": "course_id",
+                "foreignField": "course_id",
+                "pipeline": [{"$project": {"_id": 0, "course_name": "$details.course_name"}}],
+                "as": "course"
+            }},
+            {"$project": {
+                "_id": 0,
+                "course_name": {"$ifNull": [{"$first": "$course.course_name"}, "Unknown Course"]},
+                "assignment_id": 1,
+                "title": 1,
+                "description": 1,
+                "deadline": 1,
+                "max_grade": 1
+            }}
+        ]))
 
         return {"success": True, "tasks": pending}
     except PyMongoError as e:
         return {"success": False, "error": str(e)}
 
+
+
@@ -5,7 +5,8 @@ from services.student_information_service import (
     courses_col,
     enrollments_col,
     assignments_col,
-    rooms_col
+    rooms_col,
+    submissions_col
 )
 from services.academic_network_service import driver
 
@@ -25,6 +26,7 @@ def fetch_all_data_summary():
     print(f"📝 Assignments : {assignments_col.count_documents({})}")
     print(f"🏫 Rooms       : {rooms_col.count_documents({})}")
     print(f"🧾 Enrollments : {enrollments_col.count_documents({})}")
+    print(f"📨 Submissions : {submissions_col.count_documents({})}")
 
     # =========================
     # Neo4j
@@ -3,6 +3,7 @@ import uuid
 import secrets
 import string
 import time
+import argparse
 
 # =========================
 # SEED MODE
@@ -27,7 +28,17 @@ def save_credentials(filename, user_id, full_name, password):
 # IMPORTS (Mongo + Neo4j)
 # =========================
 from services.student_information_service import (
+    users_col,
+    students_col,
+    instructors_col,
+    courses_col,
+    enrollments_col,
+    assignments_col,
     rooms_col,
+    submissions_col,
+    generate_id,
+    hash_password,
+    ensure_indexes,
     register_student,
     register_instructor,
     create_course,
@@ -35,15 +46,25 @@ from services.student_information_service import (
 )
 
 from services.academic_network_service import (
+    BATCH_SIZE as NEO4J_BATCH_SIZE,
+    driver,
+    create_student_nodes,
+    link_students_to_courses,
+    link_instructors_to_courses,
+    link_assignments_to_courses,
     create_student_node,
     create_instructor_node,
-    create_assignment_node,
     link_student_to_course,
     link_instructor_to_course,
-    link_assignment_to_course
+    link_assignment_to_course,
+    read,
+    transaction
 )
 
+from services.schedule_index import normalize_schedule
 from services.course_activity_service import create_assignment
+from services.course_activity_service import ensure_indexes as ensure_assignment_indexes
+from pymongo.errors import BulkWriteError
 
 # =========================
 # CONFIG
@@ -53,6 +74,17 @@ INSTRUCTORS_COUNT = 20
 COURSES_PER_INSTRUCTOR = 2
 ASSIGNMENTS_PER_COURSE = 3
 COURSES_PER_STUDENT = 4
+ROOMS_COUNT = 20
+
+# Bulk mode flush sizes
+MONGO_BATCH_SIZE = 5000
+
+SCHEDULES = [
+    {"days": ["Sunday", "Tuesday"], "start_time": "09:00", "end_time": "11:00"},
+    {"days": ["Sunday", "Tuesday"], "start_time": "11:00", "end_time": "13:00"},
+    {"days": ["Monday", "Wednesday"], "start_time": "09:00", "end_time": "11:00"},
+    {"days": ["Monday", "Wednesday"], "start_time": "11:00", "end_time": "13:00"},
+]
 
 STUDENT_ID_START = 220000
 INSTRUCTOR_ID_PREFIX = "II"
@@ -70,7 +102,7 @@ def seed_rooms():
     rooms_col.delete_many({})
     rooms = [
         {"room": f"R{i:03}", "capacity": random.randint(80, 200)}
-        for i in range(1, 21)
+        for i in range(1, ROOMS_COUNT + 1)
     ]
     rooms_col.insert_many(rooms)
 
@@ -117,12 +149,6 @@ def seed_courses_and_assignments(instructors, rooms):
     start = time.perf_counter()
 
     courses = []
-    schedules = [
-        {"days": ["Sunday", "Tuesday"], "start_time": "09:00", "end_time": "11:00"},
-        {"days": ["Sunday", "Tuesday"], "start_time": "11:00", "end_time": "13:00"},
-        {"days": ["Monday", "Wednesday"], "start_time": "09:00", "end_time": "11:00"},
-        {"days": ["Monday", "Wednesday"], "start_time": "11:00", "end_time": "13:00"},
-    ]
 
     room_index = 0
     course_counter = 1
@@ -136,7 +162,7 @@ def seed_courses_and_assignments(instructors, rooms):
                 "course_id": course_id,
                 "details": {
                     "course_name": f"Course {course_id}",
-                    "schedule": schedules[len(courses) % len(schedules)],
+                    "schedule": SCHEDULES[len(courses) % len(SCHEDULES)],
                     "room": rooms[room_index % len(rooms)]["room"],
                     "instructor_name": instructor["name"],
                     "registered_students_count": 0
@@ -148,30 +174,29 @@ def seed_courses_and_assignments(instructors, rooms):
             if not result["success"]:
                 continue
 
-            # ✅ Instructor ↔ Course (Neo4j)
-            link_instructor_to_course(instructor["id"], course_id)
-
             courses.append(course_id)
 
-            # ===== Assignments =====
-            for a in range(ASSIGNMENTS_PER_COURSE):
-                assignment_id = str(uuid.uuid4())
-                title = f"Assignment {a + 1}"
+            # One Neo4j commit per course: TEACHES + every BELONGS_TO
+            with transaction() as tx:
+                # ✅ Instructor ↔ Course (Neo4j)
+                link_instructor_to_course(instructor["id"], course_id, tx=tx)
 
-                # Mongo
-                create_assignment(course_id, {
-                    "assignment_id": assignment_id,
-                    "title": title,
-                    "description": "Seeded assignment",
-                    "deadline": "2025-12-31 23:59",
-                    "max_grade": random.choice(range(5, 101, 5))
-                })
+                # ===== Assignments =====
+                for a in range(ASSIGNMENTS_PER_COURSE):
+                    assignment_id = str(uuid.uuid4())
+                    title = f"Assignment {a + 1}"
 
-                # Neo4j Node
-                create_assignment_node(assignment_id, title)
+                    # Mongo
+                    create_assignment(course_id, {
+                        "assignment_id": assignment_id,
+                        "title": title,
+                        "description": "Seeded assignment",
+                        "deadline": "2025-12-31 23:59",
+                        "max_grade": random.choice(range(5, 101, 5))
+                    })
 
-                # ✅ Course ↔ Assignment (THIS WAS MISSING)
-                link_assignment_to_course(assignment_id, course_id, title)
+                    # ✅ Course ↔ Assignment (node + link in one MERGE)
+                    link_assignment_to_course(assignment_id, course_id, title, tx=tx)
 
     print(f"📘 Courses & assignments done in {time.perf_counter() - start:.2f}s")
     return courses
@@ -194,14 +219,14 @@ def seed_students_and_enrollments(courses):
             {"user_id": student_id, "password": password, "role": "student"}
         )
 
-        create_student_node(student_id, full_name)
-
         selected_courses = random.sample(courses, COURSES_PER_STUDENT)
-        for course_id in selected_courses:
-            result = enroll_in_course(student_id, course_id)
-            if result["success"]:
-                # ✅ Student ↔ Course (Neo4j)
-                link_student_to_course(student_id, full_name, course_id)
+        with transaction() as tx:
+            create_student_node(student_id, full_name, tx=tx)
+            for course_id in selected_courses:
+                result = enroll_in_course(student_id, course_id)
+                if result["success"]:
+                    # ✅ Student ↔ Course (Neo4j)
+                    link_student_to_course(student_id, full_name, course_id, tx=tx)
 
         save_credentials(STUDENTS_FILE, student_id, full_name, password)
 
@@ -226,3 +251,303 @@ def run_full_seed():
     print(f" - {STUDENTS_FILE}")
 
     print("\n🎉 FULL SEED COMPLETED SUCCESSFULLY\n")
+
+
+# =========================
+# BULK MODE
+# =========================
+def scaled_counts(scale=1.0):
+    return {
+        "students": max(1, int(STUDENTS_COUNT * scale)),
+        "instructors": max(1, int(INSTRUCTORS_COUNT * scale)),
+        "rooms": max(1, int(ROOMS_COUNT * scale)),
+        "courses_per_instructor": COURSES_PER_INSTRUCTOR,
+        "assignments_per_course": ASSIGNMENTS_PER_COURSE,
+        "courses_per_student": min(COURSES_PER_STUDENT, len(SCHEDULES)),
+    }
+
+
+def _chunks(rows, size):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def _report(phase, rows, start):
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed > 0 else float("inf")
+    print(f"  ↳ {phase:<24} {rows:>8} rows in {elapsed:7.2f}s  ({rate:,.0f} rows/s)")
+    return {"phase": phase, "rows": rows, "seconds": elapsed}
+
+
+def _insert_many(collection, docs):
+    inserted = 0
+    for chunk in _chunks(docs, MONGO_BATCH_SIZE):
+        try:
+            inserted += len(collection.insert_many(chunk, ordered=False).inserted_ids)
+        except BulkWriteError as e:
+            inserted += e.details.get("nInserted", 0)
+            print(f"⚠️ {collection.name}: {len(e.details.get('writeErrors', []))} documents skipped")
+    return inserted
+
+
+def build_dataset(scale=1.0):
+    counts = scaled_counts(scale)
+    data = {
+        "rooms": [],
+        "instructors": [],
+        "students": [],
+        "users": [],
+        "courses": [],
+        "assignments": [],
+        "enrollments": [],
+        "instructor_credentials": [],
+        "student_credentials": [],
+    }
+
+    data["rooms"] = [
+        {"room": f"R{i:03}", "capacity": random.randint(80, 200)}
+        for i in range(1, counts["rooms"] + 1)
+    ]
+
+    for i in range(counts["instructors"]):
+        instructor_id = f"{INSTRUCTOR_ID_PREFIX}{i:04}"
+        full_name = f"Instructor {i + 1}"
+        password = generate_password()
+        data["instructors"].append({
+            "instructor_id": instructor_id,
+            "full_name": full_name,
+            "i_id": generate_id("instructor")
+        })
+        data["users"].append({
+            "u_id": generate_id("user"),
+            "user_id": instructor_id,
+            "password": hash_password(password),
+            "role": "instructor"
+        })
+        data["instructor_credentials"].append((instructor_id, full_name, password))
+
+    # Course k takes slot k % len(SCHEDULES) in room k // len(SCHEDULES), so no
+    # room is double booked; an instructor's consecutive courses never share a slot.
+    schedules = [normalize_schedule(s) for s in SCHEDULES]
+    slots_per_room = len(schedules)
+    max_courses = len(data["rooms"]) * slots_per_room
+    courses_by_slot = [[] for _ in SCHEDULES]
+
+    for instructor in data["instructors"]:
+        for _ in range(counts["courses_per_instructor"]):
+            k = len(data["courses"])
+            if k >= max_courses:
+                break
+            course_id = f"C{k + 1:04}"
+            data["courses"].append({
+                "course_id": course_id,
+                "details": {
+                    "course_name": f"Course {course_id}",
+                    "schedule": schedules[k % slots_per_room],
+                    "room": data["rooms"][k // slots_per_room]["room"],
+                    "instructor_name": instructor["full_name"],
+                    "registered_students_count": 0,
+                    "capacity": data["rooms"][k // slots_per_room]["capacity"]
+                },
+                "c_id": generate_id("course"),
+                "_instructor_id": instructor["instructor_id"]
+            })
+            courses_by_slot[k % slots_per_room].append(data["courses"][-1])
+
+            for a in range(counts["assignments_per_course"]):
+                data["assignments"].append({
+                    "course_id": course_id,
+                    "assignment_id": str(uuid.uuid4()),
+                    "title": f"Assignment {a + 1}",
+                    "description": "Seeded assignment",
+                    "deadline": "2025-12-31 23:59",
+                    "max_grade": random.choice(range(5, 101, 5))
+                })
+
+    for i in range(counts["students"]):
+        student_id = str(STUDENT_ID_START + i)
+        full_name = f"Student {i + 1}"
+        password = generate_password()
+        data["students"].append({
+            "student_id": student_id,
+            "full_name": full_name,
+            "s_id": generate_id("student")
+        })
+        data["users"].append({
+            "u_id": generate_id("user"),
+            "user_id": student_id,
+            "password": hash_password(password),
+            "role": "student"
+        })
+        data["student_credentials"].append((student_id, full_name, password))
+
+        # One course per schedule slot keeps every student conflict free.
+        slots = [s for s in courses_by_slot if s]
+        for slot in random.sample(slots, min(counts["courses_per_student"], len(slots))):
+            course = random.choice(slot)
+            details = course["details"]
+            if details["registered_students_count"] >= details["capacity"]:
+                continue
+            details["registered_students_count"] += 1
+            data["enrollments"].append({
+                "e_id": generate_id("enrollment"),
+                "student_id": student_id,
+                "course_id": course["course_id"],
+                "grade": "00"
+            })
+
+    return data
+
+
+# Everything the bulk seed writes. Dean accounts are not seeded, so they are
+# neither counted as existing data nor removed by clear_seeded_data().
+SEEDED_COLLECTIONS = [
+    rooms_col, instructors_col, students_col, courses_col,
+    assignments_col, enrollments_col, submissions_col
+]
+SEEDED_LABELS = ["Student", "Instructor", "Course", "Assignment"]
+_SEEDED_NODES = " OR ".join(f"n:{label}" for label in SEEDED_LABELS)
+
+
+def seeded_data_exists():
+    if any(col.find_one({}, {"_id": 1}) for col in SEEDED_COLLECTIONS):
+        return True
+    if users_col.find_one({"role": {"$ne": "dean"}}, {"_id": 1}):
+        return True
+    return bool(read(f"MATCH (n) WHERE {_SEEDED_NODES} RETURN 1 LIMIT 1"))
+
+
+def clear_seeded_data():
+    for col in SEEDED_COLLECTIONS:
+        col.delete_many({})
+    users_col.delete_many({"role": {"$ne": "dean"}})
+    # IN TRANSACTIONS needs an auto-commit query, not a managed transaction
+    with driver.session() as session:
+        session.run(
+            f"MATCH (n) WHERE {_SEEDED_NODES} "
+            f"CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF {NEO4J_BATCH_SIZE} ROWS"
+        ).consume()
+
+
+def flush_dataset(data):
+    stats = []
+    ensure_indexes()
+    ensure_assignment_indexes()
+
+    start = time.perf_counter()
+    stats.append(_report("mongo rooms", _insert_many(rooms_col, data["rooms"]), start))
+
+    start = time.perf_counter()
+    stats.append(_report("mongo instructors", _insert_many(instructors_col, data["instructors"]), start))
+
+    start = time.perf_counter()
+    stats.append(_report("mongo students", _insert_many(students_col, data["students"]), start))
+
+    start = time.perf_counter()
+    stats.append(_report("mongo users", _insert_many(users_col, data["users"]), start))
+
+    course_docs = [
+        {k: v for k, v in c.items() if not k.startswith("_")}
+        for c in data["courses"]
+    ]
+    start = time.perf_counter()
+    stats.append(_report("mongo courses", _insert_many(courses_col, course_docs), start))
+
+    start = time.perf_counter()
+    stats.append(_report("mongo assignments", _insert_many(assignments_col, data["assignments"]), start))
+
+    start = time.perf_counter()
+    stats.append(_report("mongo enrollments", _insert_many(enrollments_col, data["enrollments"]), start))
+
+    student_names = {st["student_id"]: st["full_name"] for st in data["students"]}
+    neo4j_phases = [
+        ("neo4j TEACHES", link_instructors_to_courses, [
+            (c["_instructor_id"], c["course_id"]) for c in data["courses"]
+        ]),
+        ("neo4j BELONGS_TO", link_assignments_to_courses, [
+            (a["assignment_id"], a["course_id"], a["title"]) for a in data["assignments"]
+        ]),
+        ("neo4j students", create_student_nodes, [
+            (st["student_id"], st["full_name"]) for st in data["students"]
+        ]),
+        ("neo4j ENROLLED_IN", link_students_to_courses, [
+            (e["student_id"], student_names[e["student_id"]], e["course_id"])
+            for e in data["enrollments"]
+        ]),
+    ]
+    for phase, fn, rows in neo4j_phases:
+        start = time.perf_counter()
+        result = fn(rows)
+        if "error" in result:
+            print(f"❌ {phase} failed: {result['error']}")
+            continue
+        stats.append(_report(phase, result["count"], start))
+
+    start = time.perf_counter()
+    with open(INSTRUCTORS_FILE, "w", encoding="utf-8") as f:
+        f.writelines(f"{u} | {n} | {p}\n" for u, n, p in data["instructor_credentials"])
+    with open(STUDENTS_FILE, "w", encoding="utf-8") as f:
+        f.writelines(f"{u} | {n} | {p}\n" for u, n, p in data["student_credentials"])
+    stats.append(_report(
+        "credentials files",
+        len(data["instructor_credentials"]) + len(data["student_credentials"]),
+        start
+    ))
+
+    return stats
+
+
+def run_bulk_seed(scale=1.0, reset=False):
+    # Refuses to run on a seeded database (duplicate keys in Mongo, a graph
+    # out of step with it) unless reset=True clears the previous data first.
+    if seeded_data_exists():
+        if not reset:
+            error = "Database already has seeded data; rerun with reset to replace it"
+            print(f"❌ {error}")
+            return {"success": False, "error": error}
+        print("🧹 Clearing previously seeded data...")
+        clear_seeded_data()
+
+    print(f"\n🚀 STARTING BULK SEED (scale x{scale})\n")
+    total_start = time.perf_counter()
+
+    start = time.perf_counter()
+    data = build_dataset(scale)
+    built_rows = sum(
+        len(data[k])
+        for k in ("rooms", "instructors", "students", "users", "courses", "assignments", "enrollments")
+    )
+    build_stats = _report("build in memory", built_rows, start)
+
+    stats = [build_stats] + flush_dataset(data)
+
+    total = time.perf_counter() - total_start
+    print(f"\n⏱️ Total: {total:.2f}s")
+    print("\n📄 Credentials generated:")
+    print(f" - {INSTRUCTORS_FILE}")
+    print(f" - {STUDENTS_FILE}")
+
+    print("\n🎉 BULK SEED COMPLETED SUCCESSFULLY\n")
+    return {"success": True, "seconds": total, "phases": stats}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed the university portal")
+    parser.add_argument(
+        "--scale", type=float, default=1.0,
+        help="multiplies STUDENTS_COUNT, INSTRUCTORS_COUNT and ROOMS_COUNT"
+    )
+    parser.add_argument(
+        "--reset", action="store_true",
+        help="bulk mode: delete previously seeded data (dean accounts are kept) before seeding"
+    )
+    parser.add_argument(
+        "--legacy", action="store_true",
+        help="create records one by one through the service functions"
+    )
+    args = parser.parse_args()
+
+    if args.legacy:
+        run_full_seed()
+    else:
+        run_bulk_seed(args.scale, reset=args.reset)
@@ -6,7 +6,8 @@ from services.student_information_service import (
     courses_col,
     enrollments_col,
     assignments_col,
-    rooms_col
+    rooms_col,
+    submissions_col
 )
 
 
@@ -20,6 +21,7 @@ def reset_entire_system():
     enrollments_col.delete_many({})
     assignments_col.delete_many({})
     rooms_col.delete_many({})
+    submissions_col.delete_many({})
 
     print("✅ MongoDB cleared")
 
@@ -0,0 +1,219 @@
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# ==============================
+# Time helpers
+# ==============================
+
+def to_minutes(value: str) -> int:
+    # "HH:MM" or "H:MM" -> minutes since midnight
+    hours, minutes = value.strip().split(":")
+    hours, minutes = int(hours), int(minutes)
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(f"Invalid time: {value}")
+    return hours * 60 + minutes
+
+
+DAY_BITS = {
+    "Sunday": 1,
+    "Monday": 2,
+    "Tuesday": 4,
+    "Wednesday": 8,
+    "Thursday": 16,
+    "Friday": 32,
+    "Saturday": 64,
+}
+
+
+def day_mask(days: Iterable[str]) -> int:
+    mask = 0
+    for day in days:
+        if day not in DAY_BITS:
+            raise ValueError(f"Invalid day: {day}")
+        mask |= DAY_BITS[day]
+    return mask
+
+
+def schedule_interval(schedule: dict) -> Tuple[List[str], int, int]:
+    if "start_min" in schedule and "end_min" in schedule:
+        return list(schedule["days"]), schedule["start_min"], schedule["end_min"]
+    start = to_minutes(schedule["start_time"])
+    end = to_minutes(schedule["end_time"])
+    if end <= start:
+        raise ValueError("end_time must be after start_time")
+    return list(schedule["days"]), start, end
+
+
+def normalize_schedule(schedule: dict) -> dict:
+    # Display strings stay as entered; the numeric fields are what queries use:
+    #   start_min/end_min: minutes since midnight, day_mask: DAY_BITS of the days
+    days = list(schedule["days"])
+    if not days:
+        raise ValueError("At least one day is required")
+    start = to_minutes(schedule["start_time"])
+    end = to_minutes(schedule["end_time"])
+    if end <= start:
+        raise ValueError("end_time must be after start_time")
+    return {
+        **schedule,
+        "days": days,
+        "start_min": start,
+        "end_min": end,
+        "day_mask": day_mask(days),
+    }
+
+
+# ==============================
+# Interval index
+# ==============================
+
+class _DayIntervals:
+    # Sorted [start, end) intervals for one resource on one day. Bookings can
+    # nest or overlap (legacy data, manual inserts), so max_ends[i] keeps the
+    # latest end among the first i + 1 intervals: everything starting before
+    # `end` overlaps iff that running max passes `start`. O(log n) per check.
+
+    __slots__ = ("starts", "ends", "max_ends")
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.max_ends: List[int] = []
+
+    def overlaps(self, start: int, end: int) -> bool:
+        i = bisect_left(self.starts, end)
+        return i > 0 and self.max_ends[i - 1] > start
+
+    def _refresh_max_ends(self, i: int) -> None:
+        del self.max_ends[i:]
+        running = self.max_ends[-1] if self.max_ends else 0
+        for end in self.ends[i:]:
+            running = max(running, end)
+            self.max_ends.append(running)
+
+    def add(self, start: int, end: int) -> None:
+        i = bisect_left(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self._refresh_max_ends(i)
+
+    def remove(self, start: int, end: int) -> None:
+        i = bisect_left(self.starts, start)
+        while i < len(self.starts) and self.starts[i] == start:
+            if self.ends[i] == end:
+                del self.starts[i]
+                del self.ends[i]
+                self._refresh_max_ends(i)
+                return
+            i += 1
+
+
+class ScheduleIndex:
+    # Occupied slots per room and per instructor (by full_name, as stored on
+    # courses), per day. Rooms and instructors are kept in insertion order so
+    # availability lists come back in the same order Mongo returned them.
+
+    def __init__(self):
+        self.rooms: Dict[str, dict] = {}
+        self.instructors: Dict[str, dict] = {}
+        self._room_slots = defaultdict(lambda: defaultdict(_DayIntervals))
+        self._instructor_slots = defaultdict(lambda: defaultdict(_DayIntervals))
+
+    @classmethod
+    def build(cls, rooms: Iterable[dict], instructors: Iterable[dict], courses: Iterable[dict]) -> "ScheduleIndex":
+        index = cls()
+        for room in rooms:
+            index.add_room(room)
+        for instructor in instructors:
+            index.add_instructor(instructor)
+        for course in courses:
+            try:
+                index.add_course(course)
+            except (KeyError, ValueError):
+                continue  # malformed legacy schedule, nothing to block
+        return index
+
+    def add_room(self, room: dict) -> None:
+        self.rooms[room["room"]] = room
+
+    def add_instructor(self, instructor: dict) -> None:
+        self.instructors[instructor["full_name"]] = instructor
+
+    def add_course(self, course: dict) -> None:
+        details = course["details"]
+        days, start, end = schedule_interval(details["schedule"])
+        for day in days:
+            self._room_slots[details["room"]][day].add(start, end)
+            self._instructor_slots[details["instructor_name"]][day].add(start, end)
+
+    def remove_course(self, course: dict) -> None:
+        details = course["details"]
+        days, start, end = schedule_interval(details["schedule"])
+        for day in days:
+            self._room_slots[details["room"]][day].remove(start, end)
+            self._instructor_slots[details["instructor_name"]][day].remove(start, end)
+
+    # ---- conflict checks ----
+
+    @staticmethod
+    def _is_free(slots, key: str, days: List[str], start: int, end: int) -> bool:
+        per_day = slots.get(key)
+        if not per_day:
+            return True
+        for day in days:
+            intervals = per_day.get(day)
+            if intervals is not None and intervals.overlaps(start, end):
+                return False
+        return True
+
+    def is_room_free(self, room: str, schedule: dict) -> bool:
+        days, start, end = schedule_interval(schedule)
+        return room in self.rooms and self._is_free(self._room_slots, room, days, start, end)
+
+    def is_instructor_free(self, full_name: str, schedule: dict) -> bool:
+        days, start, end = schedule_interval(schedule)
+        return (
+            full_name in self.instructors
+            and self._is_free(self._instructor_slots, full_name, days, start, end)
+        )
+
+    # ---- availability ----
+
+    def free_rooms(self, schedule: dict, min_capacity: int = 0) -> List[dict]:
+        days, start, end = schedule_interval(schedule)
+        return [
+            room for name, room in self.rooms.items()
+            if room.get("capacity", 0) >= min_capacity
+            and self._is_free(self._room_slots, name, days, start, end)
+        ]
+
+    def free_instructors(self, schedule: dict) -> List[dict]:
+        days, start, end = schedule_interval(schedule)
+        return [
+            instructor for name, instructor in self.instructors.items()
+            if self._is_free(self._instructor_slots, name, days, start, end)
+        ]
+
+    def find_free_pairs(self, schedules: Iterable[dict], min_capacity: int = 0,
+                        instructor: Optional[str] = None) -> List[dict]:
+        # For each candidate slot: free rooms, free instructors and every
+        # (room, instructor) combination that could host a new course there.
+        results = []
+        for schedule in schedules:
+            try:
+                rooms = self.free_rooms(schedule, min_capacity)
+                instructors = self.free_instructors(schedule)
+            except (KeyError, ValueError) as e:
+                results.append({"schedule": schedule, "error": str(e)})
+                continue
+            if instructor is not None:
+                instructors = [i for i in instructors if i["full_name"] == instructor]
+            results.append({
+                "schedule": schedule,
+                "rooms": rooms,
+                "instructors": instructors,
+                "pairs": [(r["room"], i["full_name"]) for r in rooms for i in instructors]
+            })
+        return results
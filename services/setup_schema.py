@@ -0,0 +1,47 @@
+import time
+
+from services.student_information_service import ensure_indexes as ensure_core_indexes
+from services.student_information_service import migrate_course_capacity, migrate_course_schedules
+from services.course_activity_service import ensure_indexes as ensure_assignment_indexes
+from services.course_activity_service import migrate_embedded_submissions
+from services.academic_network_service import ensure_schema, index_report
+
+
+def setup_schema():
+    print("🕒 Normalizing course schedules...")
+    result = migrate_course_schedules()
+    print(f"✅ {result['migrated']} courses migrated")
+    if result["skipped"]:
+        print(f"⚠️ Invalid schedules left untouched: {', '.join(map(str, result['skipped']))}")
+
+    print("📨 Moving embedded answers/grades into submissions...")
+    result = migrate_embedded_submissions()
+    print(f"✅ {result['submissions']} submissions from {result['assignments']} assignments")
+
+    print("🧱 Creating MongoDB indexes...")
+    start = time.perf_counter()
+    ensure_core_indexes(force=True)
+    ensure_assignment_indexes(force=True)
+    print(f"✅ MongoDB indexes ready in {time.perf_counter() - start:.2f}s")
+
+    print("🏫 Copying room capacity onto courses...")
+    result = migrate_course_capacity()
+    print(f"✅ {result['migrated']} courses updated")
+
+    print("🧱 Creating Neo4j constraints...")
+    start = time.perf_counter()
+    result = ensure_schema(force=True)
+    if result["success"]:
+        print(f"✅ Neo4j constraints ready in {time.perf_counter() - start:.2f}s")
+    for f in result.get("failed", []):
+        print(f"❌ Constraint {f['constraint']} on :{f['label']}({f['property']}) not created: {f['error']}")
+
+    report = index_report()
+    if "error" in report:
+        print("❌ Could not read Neo4j indexes:", report["error"])
+        return
+
+    for m in report["missing"]:
+        print(f"⚠️ Missing index: :{m['label']}({m['property']})")
+    for u in report["unused"]:
+        print(f"ℹ️ Unused index: {u['name']} on {u['labels']} {u['properties']}")
@@ -1,12 +1,16 @@
-from pymongo import MongoClient
 from datetime import datetime
+import re
 import uuid
 import bcrypt
 
+from services.connections import get_mongo_db
+from services.schedule_index import ScheduleIndex, day_mask, normalize_schedule, to_minutes
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError, OperationFailure, PyMongoError
 
 
-mongo_client = MongoClient("mongodb://localhost:27017/")
-mongo_db = mongo_client["university_portal"]
+
+mongo_db = get_mongo_db()
 
 users_col = mongo_db["users"]
 students_col = mongo_db["students"]
@@ -15,20 +19,142 @@ courses_col = mongo_db["courses"]
 enrollments_col = mongo_db["enrollments"]
 assignments_col = mongo_db["assignments"]
 rooms_col = mongo_db["rooms"]
+submissions_col = mongo_db["submissions"]
+
+_indexes_ready = False
+
+
+# Called by the write paths that rely on the unique indexes, and by admin_tools.
+def ensure_indexes(force=False):
+    global _indexes_ready
+    if _indexes_ready and not force:
+        return
+    users_col.create_index([("user_id", 1)], unique=True)
+    students_col.create_index([("student_id", 1)], unique=True)
+    instructors_col.create_index([("instructor_id", 1)], unique=True)
+    courses_col.create_index([("course_id", 1)], unique=True)
+    rooms_col.create_index([("room", 1)], unique=True)
+    enrollments_col.create_index(
+        [("student_id", 1), ("course_id", 1)],
+        unique=True
+    )
+    # Overlap queries: start_min < end AND end_min > start AND day_mask & mask
+    courses_col.create_index([
+        ("details.schedule.start_min", 1),
+        ("details.schedule.end_min", 1),
+        ("details.schedule.day_mask", 1)
+    ])
+    courses_col.create_index([
+        ("details.room", 1),
+        ("details.schedule.start_min", 1),
+        ("details.schedule.end_min", 1)
+    ])
+    courses_col.create_index([
+        ("details.instructor_name", 1),
+        ("details.schedule.start_min", 1),
+        ("details.schedule.end_min", 1)
+    ])
+    # Catalogue name search
+    courses_col.create_index([("details.course_name", "text")])
+    _indexes_ready = True
+
+
+# Room capacity copied onto each course as details.capacity so enrollment can
+# check and take a seat in one conditional update.
+DEFAULT_ROOM_CAPACITY = 20
+
+
+def room_capacity(room):
+    room_doc = rooms_col.find_one({"room": room}, {"capacity": 1, "_id": 0})
+    if not room_doc:
+        return DEFAULT_ROOM_CAPACITY
+    return room_doc.get("capacity", DEFAULT_ROOM_CAPACITY)
+
+
+def fill_course_capacity(courses):
+    # Courses created before details.capacity existed get it from one $in query.
+    missing = {
+        c["details"].get("room") for c in courses
+        if "capacity" not in c.get("details", {}) and c.get("details", {}).get("room")
+    }
+    if not missing:
+        return courses
+    capacities = {
+        r["room"]: r.get("capacity", DEFAULT_ROOM_CAPACITY)
+        for r in rooms_col.find({"room": {"$in": list(missing)}}, {"room": 1, "capacity": 1, "_id": 0})
+    }
+    for c in courses:
+        details = c.get("details", {})
+        if "capacity" not in details and details.get("room") in capacities:
+            details["capacity"] = capacities[details["room"]]
+    return courses
 
-users_col.create_index([("user_id", 1)], unique=True)
-students_col.create_index([("student_id", 1)], unique=True)
-instructors_col.create_index([("instructor_id", 1)], unique=True)
-courses_col.create_index([("course_id", 1)], unique=True)
-rooms_col.create_index([("room", 1)], unique=True)
-enrollments_col.create_index(
-    [("student_id", 1), ("course_id", 1)],
-    unique=True
-)
 
+def migrate_course_capacity():
+    capacities = {
+        r["room"]: r.get("capacity", DEFAULT_ROOM_CAPACITY)
+        for r in rooms_col.find({}, {"room": 1, "capacity": 1, "_id": 0})
+    }
+    ops = [
+        UpdateOne(
+            {"_id": c["_id"]},
+            {"$set": {"details.capacity": capacities.get(c["details"].get("room"), DEFAULT_ROOM_CAPACITY)}}
+        )
+        for c in courses_col.find(
+            {"details.capacity": {"$exists": False}},
+            {"_id": 1, "details.room": 1}
+        )
+    ]
+    if not ops:
+        return {"success": True, "migrated": 0}
+    result = courses_col.bulk_write(ops, ordered=False)
+    return {"success": True, "migrated": result.modified_count}
+
+
+# Adds start_min/end_min/day_mask to courses created before schedules were
+# normalized; overlap and catalogue queries skip courses without them. Run
+# from setup_schema (admin_tools), not on the request path.
+def migrate_course_schedules(batch_size=1000):
+    cursor = courses_col.find(
+        {"details.schedule.day_mask": {"$exists": False}},
+        {"_id": 1, "course_id": 1, "details.schedule": 1}
+    )
+    ops = []
+    migrated = 0
+    skipped = []
+    for course in cursor:
+        try:
+            schedule = normalize_schedule(course["details"]["schedule"])
+        except (KeyError, ValueError):
+            skipped.append(course.get("course_id"))
+            continue
+        ops.append(UpdateOne({"_id": course["_id"]}, {"$set": {"details.schedule": schedule}}))
+        if len(ops) >= batch_size:
+            migrated += courses_col.bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        migrated += courses_col.bulk_write(ops, ordered=False).modified_count
+    return {"success": True, "migrated": migrated, "skipped": skipped}
 
 
 
+
+# ==============================
+# Schedule index
+# ==============================
+# Interval index of booked room/instructor slots, built fresh by each caller
+# (the timetable solver mutates its copy while planning).
+def load_schedule_index():
+    return ScheduleIndex.build(
+        rooms=rooms_col.find({}, {"_id": 0}),
+        instructors=instructors_col.find({}, {"instructor_id": 1, "full_name": 1, "_id": 0}),
+        courses=courses_col.find(
+            {},
+            {"details.room": 1, "details.instructor_name": 1, "details.schedule": 1, "_id": 0}
+        )
+    )
+
+
 # Helpers fn
 # ==============================
 
@@ -36,6 +162,13 @@ def generate_id(role):
     return f"{role}_{uuid.uuid4().hex}"
 
 
+def hash_password(password):
+    return bcrypt.hashpw(
+        password.encode("utf-8"),
+        bcrypt.gensalt(rounds=4)
+    ).decode("utf-8")
+
+
 def validate_required_fields(data, required_fields):
     for field in required_fields:
         if field not in data:
@@ -46,6 +179,35 @@ def validate_required_fields(data, required_fields):
     return {"success": True}
 
 
+def overlap_filter(schedule):
+    # Mongo filter for courses whose schedule overlaps `schedule` (normalized)
+    return {
+        "details.schedule.start_min": {"$lt": schedule["end_min"]},
+        "details.schedule.end_min": {"$gt": schedule["start_min"]},
+        "details.schedule.day_mask": {"$bitsAnySet": schedule["day_mask"]}
+    }
+
+
+def booking_clash(room, instructor, schedule):
+    # Error message if `room` or `instructor` is already booked during the
+    # normalized `schedule`, else None.
+    clash = courses_col.find_one(
+        {
+            **overlap_filter(schedule),
+            "$or": [
+                {"details.room": room},
+                {"details.instructor_name": instructor}
+            ]
+        },
+        {"details.room": 1, "_id": 0}
+    )
+    if not clash:
+        return None
+    if clash["details"]["room"] == room:
+        return f"Room {room} is not available at this time"
+    return f"Instructor {instructor} is busy at this time"
+
+
 def has_time_conflict(student_id, new_course):
     
     enrolled_courses_ids = enrollments_col.find(
@@ -53,31 +215,26 @@ def has_time_conflict(student_id, new_course):
         {"course_id": 1, "_id": 0}
     )
 
-    enrolled_ids = [e["course_id"] for e in enrolled_courses_ids]
+    enrolled_ids = [
+        e["course_id"] for e in enrolled_courses_ids
+        if e["course_id"] != new_course.get("course_id")
+    ]
 
     if not enrolled_ids:
         return False
 
-    enrolled_courses = courses_col.find(
-        {"course_id": {"$in": enrolled_ids}},
-        {"details.schedule": 1}
-    )
-
-    for course in enrolled_courses:
-        s1 = course["details"]["schedule"]["start_time"]
-        e1 = course["details"]["schedule"]["end_time"]
-
-        s2 = new_course["details"]["schedule"]["start_time"]
-        e2 = new_course["details"]["schedule"]["end_time"]
-
-        days1 = set(course["details"]["schedule"]["days"])
-        days2 = set(new_course["details"]["schedule"]["days"])
-
-        if days1 & days2:  # common day
-            if s1 < e2 and s2 < e1:
-                return True
+    schedule = new_course["details"]["schedule"]
+    if "day_mask" not in schedule:
+        try:
+            schedule = normalize_schedule(schedule)
+        except (KeyError, ValueError):
+            return False
 
-    return False
+    conflict = courses_col.find_one(
+        {"course_id": {"$in": enrolled_ids}, **overlap_filter(schedule)},
+        {"_id": 1}
+    )
+    return conflict is not None
 
 
 
@@ -89,6 +246,7 @@ def create_user(userData):
     res = validate_required_fields(userData, ["user_id", "password", "role"])
     if not res["success"]:
         return res
+    ensure_indexes()
     target_role = userData["role"]
     target_id = userData["user_id"] #     student_id or instructor_id
 
@@ -126,15 +284,10 @@ def create_user(userData):
         }
 
 
-    password = bcrypt.hashpw(
-        userData["password"].encode("utf-8"),
-        bcrypt.gensalt(rounds=4)
-    )
-
     user_doc = {
         "u_id": generate_id("user"),
         "user_id": target_id,     
-        "password": password.decode("utf-8"),
+        "password": hash_password(userData["password"]),
         "role": target_role
     }
     users_col.insert_one(user_doc)
@@ -150,6 +303,7 @@ def create_student(studentData):
     res = validate_required_fields(studentData, ["student_id", "full_name"])
     if not res["success"]:
         return res
+    ensure_indexes()
     existing_student = students_col.find_one(
         {"student_id": studentData["student_id"]}
     )
@@ -173,6 +327,7 @@ def create_instructor(instructorData):
     res = validate_required_fields(instructorData,["instructor_id", "full_name"])
     if not res["success"]:
         return res
+    ensure_indexes()
     existing_instructor = instructors_col.find_one(
         {"instructor_id": instructorData["instructor_id"]}
     )
@@ -205,6 +360,7 @@ def create_course(courseData):
 
     if not res["success"]:
         return res
+    ensure_indexes()
     existing_course = courses_col.find_one(
         {
             "course_id": courseData["course_id"],
@@ -218,30 +374,41 @@ def create_course(courseData):
         }
 
 # 3. --- Time/Room Conflict Check ---
-    schedule = courseData["details"]["schedule"]
+    try:
+        schedule = normalize_schedule(courseData["details"]["schedule"])
+    except (KeyError, ValueError):
+        return {
+            "success": False,
+            "error": "Invalid schedule, expected days and HH:MM start/end times"
+        }
+    courseData["details"]["schedule"] = schedule
     room = courseData["details"]["room"]
+    instructor = courseData["details"]["instructor_name"]
+    room_doc = rooms_col.find_one({"room": room}, {"capacity": 1, "_id": 0})
 
-    available_rooms = [r["room"] for r in get_available_rooms(schedule)]
-    if room not in available_rooms:
+    if not room_doc:
         return {
             "success": False,
             "error": f"Room {room} is not available at this time"
         }
 
 # 4. --- Instructor Conflict Check ---
-    instructor = courseData["details"]["instructor_name"]
-
-    available_instructors = get_available_instructors(schedule)
-    available_names = [
-    i["full_name"] for i in available_instructors
-    ]
-    if instructor not in available_names:
+    if not instructors_col.find_one({"full_name": instructor}, {"_id": 1}):
         return {
             "success": False,
             "error": f"Instructor {instructor} is busy at this time"
         }
 
+# 5. --- Overlapping room or instructor bookings ---
+    clash = booking_clash(room, instructor, schedule)
+    if clash:
+        return {
+            "success": False,
+            "error": clash
+        }
+
 
+    courseData["details"]["capacity"] = room_doc.get("capacity", DEFAULT_ROOM_CAPACITY)
     courseData["c_id"] = generate_id("course")
     result=courses_col.insert_one(courseData)
     return {
@@ -291,11 +458,59 @@ def register_instructor(instructorData, userData):
 # Retrieval Functions
 # ==============================
 
+def course_details_pipeline(courseID: str, studentID: str) -> list:
+    # course -> its assignments -> this student's submission (both lookups use
+    # the assignments.course_id and submissions (assignment_id, student_id) indexes)
+    task_fields = {
+        "assignment_id": "$$this.assignment_id",
+        "title": "$$this.title",
+        "description": "$$this.description",
+        "deadline": "$$this.deadline",
+        "max_grade": "$$this.max_grade"
+    }
+    answered = {"$ne": [{"$type": "$$this.submission.text"}, "missing"]}
+    return [
+        {"$match": {"course_id": courseID}},
+        {"$limit": 1},
+        {"$lookup": {
+            "from": "assignments",
+            "localField": "course_id",
+            "foreignField": "course_id",
+            "pipeline": [
+                {"$lookup": {
+                    "from": "submissions",
+                    "localField": "assignment_id",
+                    "foreignField": "assignment_id",
+                    "pipeline": [
+                        {"$match": {"student_id": studentID}},
+                        {"$project": {"_id": 0, "text": 1, "grade": 1}}
+                    ],
+                    "as": "submission"
+                }},
+                {"$project": {
+                    "_id": 0, "assignment_id": 1, "title": 1, "description": 1,
+                    "deadline": 1, "max_grade": 1,
+                    "submission": {"$first": "$submission"}
+                }}
+            ],
+            "as": "assignments"
+        }},
+        {"$set": {
+            "completed_tasks": {"$map": {
+                "input": {"$filter": {"input": "$assignments", "cond": answered}},
+                "in": {**task_fields, "grade": "$$this.submission.grade", "answer": "$$this.submission.text"}
+            }},
+            "pending_tasks": {"$map": {
+                "input": {"$filter": {"input": "$assignments", "cond": {"$not": [answered]}}},
+                "in": task_fields
+            }}
+        }},
+        {"$unset": ["_id", "assignments"]}
+    ]
+
+
 def get_course_details(courseID: str, studentID: str) -> dict:
-    course = courses_col.find_one(
-        {"course_id": courseID},
-        {"_id": 0}
-    )
+    course = next(courses_col.aggregate(course_details_pipeline(courseID, studentID)), None)
 
     if not course:
         return {
@@ -303,45 +518,8 @@ def get_course_details(courseID: str, studentID: str) -> dict:
         "error": "Course not found"
     }
 
-
-    assignments = list(assignments_col.find(
-        {"course_id": courseID},
-        {"_id": 0}
-    ))
-
-    completed_tasks = []
-    pending_tasks = []
-    for a in assignments:
-        submitted_students = {
-            ans["student_id"] for ans in a.get("answer_text", [])
-        }
-        student_answer_text = None
-        for ans in a.get("answer_text", []):
-            if ans["student_id"] == studentID:
-                student_answer_text = ans.get("text")
-                break
-        task_info = {
-            "assignment_id": a.get("assignment_id"),
-            "title": a.get("title"),
-            "description": a.get("description"),
-            "deadline": a.get("deadline"),
-            "max_grade": a.get("max_grade")
-        }
-
-        if studentID in submitted_students:
-            grade = None
-            for g in a.get("grades", []):
-                if g["student_id"] == studentID:
-                    grade = g.get("grade")
-                    break
-
-            completed_tasks.append({
-                **task_info,
-                "grade": grade,
-                "answer": student_answer_text
-            })
-        else:
-            pending_tasks.append(task_info)
+    completed_tasks = course.pop("completed_tasks")
+    pending_tasks = course.pop("pending_tasks")
 
     return {
         "success": True,
@@ -363,134 +541,98 @@ def get_courses(courseIDs):
     return list(course_pointer)
 
 def get_available_rooms(schedule):
-    target_days = schedule["days"]
-    target_start = schedule["start_time"]
-    target_end = schedule["end_time"]
-
-    all_rooms = list(rooms_col.find({}, {"_id": 0}))
-
-    busy_cursor = courses_col.find(
-    {
-        "details.schedule.days": {"$in": target_days}
-    },
-    {"details.room": 1, "details.schedule": 1, "_id": 0}
-)
-
-
-
-
-
-    busy_rooms = []
-
-    for doc in busy_cursor:
-        existing_start = doc["details"]["schedule"]["start_time"]
-        existing_end = doc["details"]["schedule"]["end_time"]
-        if existing_start < target_end and target_start < existing_end:
-            busy_rooms.append(doc["details"]["room"])
-
-    available_rooms = []
-
-    for room_doc in all_rooms:
-        if room_doc["room"] not in busy_rooms:
-            available_rooms.append(room_doc)
+    try:
+        schedule = normalize_schedule(schedule)
+    except (KeyError, ValueError):
+        return []
 
-    return available_rooms
+    busy_rooms = courses_col.distinct("details.room", overlap_filter(schedule))
+    return list(rooms_col.find({"room": {"$nin": busy_rooms}}, {"_id": 0}))
 
 
 def get_available_instructors(schedule):
-    target_days = schedule["days"]
-    target_start = schedule["start_time"]
-    target_end = schedule["end_time"]
-
-    cursor_instructors = instructors_col.find({}, {"instructor_id": 1, "full_name": 1, "_id": 0})
-    # Create list of all available instructor names
-    all_instructors = [
-    {
-        "instructor_id": i["instructor_id"],
-        "full_name": i["full_name"]
-    }
-    for i in cursor_instructors
-]
-    
-    busy_cursor = courses_col.find(
-    {
-        "details.schedule.days": {"$in": target_days}
-    },
-    {"details.instructor_name": 1, "details.schedule": 1, "_id": 0}
-)
-
-
-    busy_instructors = []
-
-    for doc in busy_cursor:
-        existing_start = doc["details"]["schedule"]["start_time"]
-        existing_end = doc["details"]["schedule"]["end_time"]
+    try:
+        schedule = normalize_schedule(schedule)
+    except (KeyError, ValueError):
+        return []
 
-        if existing_start < target_end and target_start < existing_end:
-            busy_instructors.append(doc["details"]["instructor_name"])
+    busy_instructors = courses_col.distinct("details.instructor_name", overlap_filter(schedule))
+    return list(instructors_col.find(
+        {"full_name": {"$nin": busy_instructors}},
+        {"instructor_id": 1, "full_name": 1, "_id": 0}
+    ))
 
-    available = []
 
-    for instructor in all_instructors:
-        if instructor["full_name"] not in busy_instructors:
-            available.append(instructor)
+# ==============================
+# Enrollment Functions
+# ==============================
 
+def _reserve_seat(courseID):
+    # Atomically takes a seat only while registered_students_count < capacity.
+    return courses_col.find_one_and_update(
+        {
+            "course_id": courseID,
+            "$expr": {"$lt": ["$details.registered_students_count", "$details.capacity"]}
+        },
+        {"$inc": {"details.registered_students_count": 1}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
 
-    return available
 
+def _release_seat(courseID):
+    courses_col.update_one(
+        {"course_id": courseID, "details.registered_students_count": {"$gt": 0}},
+        {"$inc": {"details.registered_students_count": -1}}
+    )
 
-# ==============================
-# Enrollment Functions
-# ==============================
 
 def enroll_in_course(studentID, courseID):
-    student = students_col.find_one({"student_id": studentID})
+    ensure_indexes()
+    student = students_col.find_one({"student_id": studentID}, {"_id": 1})
     if not student:
         return {
             "success": False,
             "error": f"Student with ID '{studentID}' not found."
         }    
-    course = courses_col.find_one({"course_id": courseID})
-    if not course:
-        return {
-            "success": False,
-            "error": f"Course with ID '{courseID}' not found."
-        }
 
-    
-    existing_enrollment = enrollments_col.find_one(
-        {"student_id": studentID, "course_id": courseID}
-    )
-    if existing_enrollment:
-        return {
-        "success": False,
-        "error": f"Student is already enrolled in this course."
-    }
-
-    # -------------------------------------
-    # check capacity:
-    room = course["details"]["room"]
-    current_count = course["details"]["registered_students_count"]
-
-
-    room_doc = rooms_col.find_one({"room": room})
-
-    if room_doc:
-        # Default to 20 if capacity is missing
-        max_capacity = room_doc.get("capacity", 20)
-        
-        if current_count >= max_capacity:
+    course = _reserve_seat(courseID)
+    if not course:
+        # Either the course is missing, full, or predates denormalized capacity.
+        existing = courses_col.find_one(
+            {"course_id": courseID},
+            {"details.room": 1, "details.capacity": 1, "_id": 0}
+        )
+        if not existing:
             return {
                 "success": False,
-                "error": f"Course is full! (Capacity: {max_capacity})"
+                "error": f"Course with ID '{courseID}' not found."
+            }
+        if "capacity" not in existing["details"]:
+            capacity = room_capacity(existing["details"]["room"])
+            courses_col.update_one(
+                {"course_id": courseID, "details.capacity": {"$exists": False}},
+                {"$set": {"details.capacity": capacity}}
+            )
+            course = _reserve_seat(courseID)
+        if not course:
+            if enrollments_col.find_one({"student_id": studentID, "course_id": courseID}, {"_id": 1}):
+                return {
+                    "success": False,
+                    "error": f"Student is already enrolled in this course."
+                }
+            capacity = existing["details"].get("capacity") or room_capacity(existing["details"]["room"])
+            return {
+                "success": False,
+                "error": f"Course is full! (Capacity: {capacity})"
             }
 
-    else:
-        pass
-
-    # --------------------------
+    # Seat is held from here on; give it back on any failure. The conflict
+    # check skips this course, so re-enrolling falls through to the unique
+    # index below and is reported as already enrolled.
     if has_time_conflict(studentID, course):
-            return {
+        _release_seat(courseID)
+        return {
             "success": False,
             "error": f"Schedule conflict with another enrolled course."
         }
@@ -501,46 +643,140 @@ def enroll_in_course(studentID, courseID):
         "course_id": courseID,
         "grade": "00"
     }
-    enrollments_col.insert_one(enrollmentData)
+    try:
+        enrollments_col.insert_one(enrollmentData)
+    except DuplicateKeyError:
+        _release_seat(courseID)
+        return {
+            "success": False,
+            "error": f"Student is already enrolled in this course."
+        }
+    except PyMongoError:
+        _release_seat(courseID)
+        raise
 
-    courses_col.update_one( {"course_id": courseID}, {"$inc": {"details.registered_students_count": 1}} )
     return {
         "success": True,
-        "message": "Enrolled Successfully"
+        "message": "Enrolled Successfully",
+        "course": course
     }
 
 
 
-def get_available_courses_for_registration(enrolled_ids):
-    if not enrolled_ids:
-        cursor = courses_col.find(
-            {},
-            {"_id": 0}
-        )
-    else:
-        cursor = courses_col.find(
-            {"course_id": {"$nin": enrolled_ids}},
-            {"_id": 0}
-        )
+# ==============================
+# Course catalogue
+# ==============================
+# Keyset pagination on course_id: pass the previous page's next_cursor as
+# `after`. Only the fields the course browser shows are returned.
+CATALOGUE_PAGE_SIZE = 20
+CATALOGUE_PROJECTION = {
+    "_id": 0,
+    "course_id": 1,
+    "details.course_name": 1,
+    "details.instructor_name": 1,
+    "details.room": 1,
+    "details.schedule.days": 1,
+    "details.schedule.start_time": 1,
+    "details.schedule.end_time": 1,
+    "details.registered_students_count": 1,
+    "details.capacity": 1
+}
+
+
+def catalogue_filter(enrolled_ids=None, days=None, from_time=None, to_time=None,
+                     instructor_name=None, free_seats_only=False, search=None):
+    # Raises ValueError for unknown days or malformed times.
+    query = {}
+    if enrolled_ids:
+        query["course_id"] = {"$nin": list(enrolled_ids)}
+    if days:
+        query["details.schedule.day_mask"] = {"$bitsAnySet": day_mask(days)}
+    if from_time:
+        query["details.schedule.start_min"] = {"$gte": to_minutes(from_time)}
+    if to_time:
+        query["details.schedule.end_min"] = {"$lte": to_minutes(to_time)}
+    if instructor_name:
+        query["details.instructor_name"] = instructor_name
+    if free_seats_only:
+        query["$expr"] = {"$lt": ["$details.registered_students_count", "$details.capacity"]}
+    if search:
+        query["$text"] = {"$search": search}
+    return query
+
+
+def _catalogue_page(query, limit):
+    return list(
+        courses_col.find(query, CATALOGUE_PROJECTION)
+        .sort("course_id", 1)
+        .limit(limit + 1)
+    )
+
 
-    return list(cursor)
+def get_course_catalogue(enrolled_ids=None, after=None, limit=CATALOGUE_PAGE_SIZE, **filters):
+    """
+    filters: days, from_time, to_time ("HH:MM"), instructor_name,
+    free_seats_only, search (words in the course name)
+    """
+    try:
+        query = catalogue_filter(enrolled_ids, **filters)
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+    if after:
+        query.setdefault("course_id", {})["$gt"] = after
+
+    try:
+        courses = _catalogue_page(query, limit)
+    except OperationFailure:
+        if "$text" not in query:
+            raise
+        # No text index (e.g. setup not run yet): match any word by regex instead
+        words = query.pop("$text")["$search"].split()
+        query["details.course_name"] = {
+            "$regex": "|".join(re.escape(w) for w in words),
+            "$options": "i"
+        }
+        courses = _catalogue_page(query, limit)
+    has_more = len(courses) > limit
+    courses = courses[:limit]
+    return {
+        "success": True,
+        "courses": fill_course_capacity(courses),
+        "next_cursor": courses[-1]["course_id"] if has_more else None
+    }
 
 
+def get_seat_counts(courseIDs):
+    # course_id -> current registered_students_count, for overlaying on cached pages
+    if not courseIDs:
+        return {}
+    return {
+        c["course_id"]: c["details"].get("registered_students_count", 0)
+        for c in courses_col.find(
+            {"course_id": {"$in": list(courseIDs)}},
+            {"_id": 0, "course_id": 1, "details.registered_students_count": 1}
+        )
+    }
 
 
 # ==============================
 # Performance Functions
 # ==============================
 def get_student_performance(studentID):
-    enrollments_cursor = enrollments_col.find({"student_id": studentID})
+    enrollments = list(enrollments_col.find({"student_id": studentID}))
+    course_names = {
+        c["course_id"]: c["details"]["course_name"]
+        for c in courses_col.find(
+            {"course_id": {"$in": [e["course_id"] for e in enrollments]}},
+            {"_id": 0, "course_id": 1, "details.course_name": 1}
+        )
+    }
     
     student_report = []
     
-    for enrollment in enrollments_cursor:
+    for enrollment in enrollments:
         c_id = enrollment["course_id"]
         grade = enrollment["grade"] 
-        course_doc = courses_col.find_one({"course_id": c_id})
-        course_name = course_doc["details"]["course_name"] if course_doc else "Unknown"
+        course_name = course_names.get(c_id, "Unknown")
         
         performance_card={
             "course_id": c_id,
@@ -0,0 +1,314 @@
+import csv
+import time
+from bisect import bisect_left
+
+from pymongo.errors import BulkWriteError
+
+from services.academic_network_service import link_instructors_to_courses
+from services.schedule_index import normalize_schedule, to_minutes
+from services.student_information_service import (
+    booking_clash,
+    courses_col,
+    instructors_col,
+    DEFAULT_ROOM_CAPACITY,
+    ensure_indexes,
+    generate_id,
+    load_schedule_index,
+    validate_required_fields
+)
+
+
+# ==============================
+# Candidate slots
+# ==============================
+# (days, block length in minutes); blocks are laid back to back from
+# DAY_START to DAY_END.
+DEFAULT_DAY_PATTERNS = [
+    (["Sunday", "Tuesday"], 120),
+    (["Monday", "Wednesday"], 120),
+    (["Thursday"], 240),
+]
+DAY_START = "08:00"
+DAY_END = "18:00"
+
+MAX_REPAIR_ATTEMPTS = 1000
+
+
+def _hhmm(minutes):
+    return f"{minutes // 60:02}:{minutes % 60:02}"
+
+
+def default_slots(day_patterns=DEFAULT_DAY_PATTERNS, day_start=DAY_START, day_end=DAY_END):
+    first, last = to_minutes(day_start), to_minutes(day_end)
+    slots = []
+    for days, length in day_patterns:
+        start = first
+        while start + length <= last:
+            slots.append(normalize_schedule({
+                "days": days,
+                "start_time": _hhmm(start),
+                "end_time": _hhmm(start + length)
+            }))
+            start += length
+    return slots
+
+
+def _slot_key(schedule):
+    return (schedule["day_mask"], schedule["start_min"], schedule["end_min"])
+
+
+# ==============================
+# Input
+# ==============================
+
+def load_course_requests_csv(path):
+    """
+    CSV columns:
+    - course_id, course_name (required)
+    - expected_enrollment
+    - instructor_name (fixed instructor, optional)
+    - preferred_instructors (";"-separated full names, optional)
+    Blank lines are skipped; a row without a course_id or course_name raises
+    ValueError naming its line.
+    """
+    requests = []
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            if not any((value or "").strip() for value in row.values() if isinstance(value, str)):
+                continue
+            request = {
+                "course_id": (row.get("course_id") or "").strip().upper(),
+                "course_name": (row.get("course_name") or "").strip(),
+                "expected_enrollment": int(row.get("expected_enrollment") or 0),
+            }
+            for field in ("course_id", "course_name"):
+                if not request[field]:
+                    raise ValueError(f"Line {reader.line_num}: {field} is empty")
+            if (row.get("instructor_name") or "").strip():
+                request["instructor_name"] = row["instructor_name"].strip()
+            if (row.get("preferred_instructors") or "").strip():
+                request["preferred_instructors"] = [
+                    name.strip() for name in row["preferred_instructors"].split(";") if name.strip()
+                ]
+            requests.append(request)
+    return requests
+
+
+# ==============================
+# Solver
+# ==============================
+
+class _Planner:
+    # Greedy placement (most constrained courses first, smallest room that
+    # fits) followed by a repair pass that moves one already-planned course
+    # out of the way of each course left over.
+
+    def __init__(self, index, slots):
+        self.index = index
+        self.slots = slots
+        self.rooms = sorted(index.rooms.values(), key=lambda r: r.get("capacity", 0))
+        self.capacities = [r.get("capacity", 0) for r in self.rooms]
+        self.instructor_names = list(index.instructors)
+        self.next_instructor = 0
+        self.placed = {}      # course_id -> course document
+        self.occupant = {}    # (room, slot key) -> course_id planned there
+        self.requests = {}    # course_id -> request
+
+    def _instructor_for(self, request, slot):
+        fixed = request.get("instructor_name")
+        if fixed:
+            return fixed if self.index.is_instructor_free(fixed, slot) else None
+
+        for name in request.get("preferred_instructors", []):
+            if self.index.is_instructor_free(name, slot):
+                return name
+
+        # Round robin from where the last pick stopped spreads the load
+        # without scanning every instructor for every slot.
+        total = len(self.instructor_names)
+        for step in range(total):
+            name = self.instructor_names[(self.next_instructor + step) % total]
+            if self.index.is_instructor_free(name, slot):
+                self.next_instructor = (self.next_instructor + step + 1) % total
+                return name
+        return None
+
+    def _rooms_for(self, request, slot):
+        i = bisect_left(self.capacities, request.get("expected_enrollment", 0))
+        for room in self.rooms[i:]:
+            if self.index.is_room_free(room["room"], slot):
+                yield room
+
+    def _candidate_slots(self, request):
+        preferred = [normalize_schedule(s) for s in request.get("preferred_slots", [])]
+        return preferred + self.slots
+
+    def _book(self, request, slot, room, instructor):
+        return self._add({
+            "course_id": request["course_id"],
+            "details": {
+                "course_name": request["course_name"],
+                "schedule": dict(slot),
+                "room": room["room"],
+                "instructor_name": instructor,
+                "registered_students_count": 0,
+                "capacity": room.get("capacity", DEFAULT_ROOM_CAPACITY)
+            },
+            "c_id": generate_id("course")
+        })
+
+    def _add(self, course):
+        details = course["details"]
+        self.index.add_course(course)
+        self.placed[course["course_id"]] = course
+        self.occupant[(details["room"], _slot_key(details["schedule"]))] = course["course_id"]
+        return course
+
+    def _unbook(self, course_id):
+        course = self.placed.pop(course_id)
+        details = course["details"]
+        self.index.remove_course(course)
+        del self.occupant[(details["room"], _slot_key(details["schedule"]))]
+        return course
+
+    def place(self, request):
+        for slot in self._candidate_slots(request):
+            room = next(self._rooms_for(request, slot), None)
+            if room is None:
+                continue
+            instructor = self._instructor_for(request, slot)
+            if instructor is None:
+                continue
+            return self._book(request, slot, room, instructor)
+        return None
+
+    def repair(self, request, budget):
+        # Try to free a suitable room by moving the course planned there.
+        # `budget` is a one-element list shared across calls: moves left to try.
+        needed = request.get("expected_enrollment", 0)
+        for slot in self._candidate_slots(request):
+            key = _slot_key(slot)
+            for room in self.rooms[bisect_left(self.capacities, needed):]:
+                blocker_id = self.occupant.get((room["room"], key))
+                if blocker_id is None:
+                    continue
+                if budget[0] <= 0:
+                    return False
+                budget[0] -= 1
+                blocker = self._unbook(blocker_id)
+                instructor = self._instructor_for(request, slot)
+                if instructor is not None and self.index.is_room_free(room["room"], slot):
+                    self._book(request, slot, room, instructor)
+                    if self.place(self.requests[blocker_id]) is not None:
+                        return True
+                    self._unbook(request["course_id"])
+                self._add(blocker)
+        return False
+
+
+def solve_timetable(course_requests, slots=None, max_repair_attempts=MAX_REPAIR_ATTEMPTS):
+    start = time.perf_counter()
+    index = load_schedule_index()
+    planner = _Planner(index, slots if slots is not None else default_slots())
+
+    unscheduled = []
+    ids = [r.get("course_id") for r in course_requests]
+    existing = {
+        c["course_id"]
+        for c in courses_col.find({"course_id": {"$in": ids}}, {"course_id": 1, "_id": 0})
+    }
+    max_capacity = planner.capacities[-1] if planner.capacities else 0
+
+    for request in course_requests:
+        res = validate_required_fields(request, ["course_id", "course_name"])
+        course_id = request.get("course_id")
+        blank = [f for f in ("course_id", "course_name") if not str(request.get(f) or "").strip()]
+        if not res["success"]:
+            unscheduled.append({"course_id": course_id, "reason": res["error"]})
+        elif blank:
+            unscheduled.append({"course_id": course_id, "reason": f"Empty field: {blank[0]}"})
+        elif course_id in existing or course_id in planner.requests:
+            unscheduled.append({"course_id": course_id, "reason": "Course already exists"})
+        elif request.get("instructor_name") and request["instructor_name"] not in index.instructors:
+            unscheduled.append({"course_id": course_id, "reason": f"Unknown instructor {request['instructor_name']}"})
+        elif request.get("expected_enrollment", 0) > max_capacity:
+            unscheduled.append({"course_id": course_id, "reason": f"No room holds {request['expected_enrollment']} students"})
+        else:
+            planner.requests[course_id] = request
+
+    # Fixed-instructor and large courses have the fewest options, so go first.
+    order = sorted(
+        planner.requests.values(),
+        key=lambda r: (not r.get("instructor_name"), -r.get("expected_enrollment", 0))
+    )
+    leftovers = [r for r in order if planner.place(r) is None]
+
+    budget = [max_repair_attempts]
+    for request in leftovers:
+        if planner.repair(request, budget):
+            continue
+        unscheduled.append({"course_id": request["course_id"], "reason": "No free room/instructor/slot combination"})
+
+    return {
+        "success": True,
+        "scheduled": list(planner.placed.values()),
+        "unscheduled": unscheduled,
+        "seconds": time.perf_counter() - start
+    }
+
+
+# ==============================
+# Commit
+# ==============================
+
+def commit_timetable(scheduled):
+    # The plan was made against a snapshot; re-check every placement against
+    # Mongo so courses booked since then are not double-booked.
+    if not scheduled:
+        return {"success": True, "inserted": [], "failed": [], "instructor_ids": []}
+
+    ensure_indexes()
+    failed = []
+    to_insert = []
+    for course in scheduled:
+        details = course["details"]
+        clash = booking_clash(details["room"], details["instructor_name"], details["schedule"])
+        if clash:
+            failed.append({"course_id": course["course_id"], "error": clash})
+        else:
+            to_insert.append(course)
+
+    failed_positions = {}
+    if to_insert:
+        try:
+            courses_col.insert_many(to_insert, ordered=False)
+        except BulkWriteError as e:
+            failed_positions = {
+                err["index"]: err.get("errmsg", "write failed")
+                for err in e.details.get("writeErrors", [])
+            }
+
+    inserted = [c for i, c in enumerate(to_insert) if i not in failed_positions]
+    failed += [
+        {"course_id": to_insert[i]["course_id"], "error": errmsg}
+        for i, errmsg in sorted(failed_positions.items())
+    ]
+
+    names = list({c["details"]["instructor_name"] for c in inserted})
+    ids_by_name = {
+        i["full_name"]: i["instructor_id"]
+        for i in instructors_col.find({"full_name": {"$in": names}}, {"_id": 0, "instructor_id": 1, "full_name": 1})
+    }
+    link_instructors_to_courses([
+        (ids_by_name[c["details"]["instructor_name"]], c["course_id"])
+        for c in inserted
+        if c["details"]["instructor_name"] in ids_by_name
+    ])
+
+    return {
+        "success": not failed,
+        "inserted": [c["course_id"] for c in inserted],
+        "failed": failed,
+        "instructor_ids": sorted(set(ids_by_name.values()))
+    }
@@ -0,0 +1,50 @@
+from services.schedule_index import ScheduleIndex
+
+
+def _course(course_id, room, instructor, start, end, days=("Sunday",)):
+    return {
+        "course_id": course_id,
+        "details": {
+            "room": room,
+            "instructor_name": instructor,
+            "schedule": {"days": list(days), "start_time": start, "end_time": end}
+        }
+    }
+
+
+def _schedule(start, end, days=("Sunday",)):
+    return {"days": list(days), "start_time": start, "end_time": end}
+
+
+def _index(*courses):
+    return ScheduleIndex.build(
+        [{"room": "R1", "capacity": 30}],
+        [{"full_name": "A"}, {"full_name": "B"}],
+        courses
+    )
+
+
+def test_nested_interval_blocks_tail_of_outer_booking():
+    index = _index(
+        _course("C1", "R1", "A", "09:00", "12:00"),
+        _course("C2", "R1", "B", "10:00", "11:00")
+    )
+    assert not index.is_room_free("R1", _schedule("11:00", "11:30"))
+    assert not index.is_room_free("R1", _schedule("11:30", "12:30"))
+    assert index.is_room_free("R1", _schedule("12:00", "13:00"))
+    assert index.is_room_free("R1", _schedule("08:00", "09:00"))
+
+
+def test_remove_outer_interval_frees_tail():
+    outer = _course("C1", "R1", "A", "09:00", "12:00")
+    index = _index(outer, _course("C2", "R1", "B", "10:00", "11:00"))
+    index.remove_course(outer)
+    assert index.is_room_free("R1", _schedule("11:00", "11:30"))
+    assert not index.is_room_free("R1", _schedule("10:30", "11:30"))
+
+
+def test_other_day_and_instructor():
+    index = _index(_course("C1", "R1", "A", "09:00", "12:00"))
+    assert index.is_room_free("R1", _schedule("10:00", "11:00", ("Monday",)))
+    assert not index.is_instructor_free("A", _schedule("11:00", "11:30"))
+    assert index.is_instructor_free("B", _schedule("11:00", "11:30"))
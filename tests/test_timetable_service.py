@@ -0,0 +1,53 @@
+import pytest
+
+pytest.importorskip("pymongo")
+pytest.importorskip("bcrypt")
+pytest.importorskip("neo4j")
+
+from services import timetable_service
+from services.schedule_index import ScheduleIndex
+
+
+class _NoCourses:
+    def find(self, *args, **kwargs):
+        return []
+
+
+@pytest.fixture
+def empty_campus(monkeypatch):
+    index = ScheduleIndex.build([{"room": "R1", "capacity": 30}], [{"full_name": "A"}], [])
+    monkeypatch.setattr(timetable_service, "load_schedule_index", lambda: index)
+    monkeypatch.setattr(timetable_service, "courses_col", _NoCourses())
+
+
+def _write_csv(tmp_path, *rows):
+    path = tmp_path / "courses.csv"
+    path.write_text(
+        "course_id,course_name,expected_enrollment,instructor_name,preferred_instructors\n"
+        + "".join(row + "\n" for row in rows),
+        encoding="utf-8"
+    )
+    return str(path)
+
+
+def test_csv_row_without_id_or_name_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Line 3: course_id"):
+        timetable_service.load_course_requests_csv(_write_csv(tmp_path, "cs101,Intro,10,,", ",,10,,"))
+
+
+def test_csv_skips_blank_rows(tmp_path):
+    requests = timetable_service.load_course_requests_csv(_write_csv(tmp_path, "cs101,Intro,10,,", ",,,,"))
+    assert [r["course_id"] for r in requests] == ["CS101"]
+
+
+def test_blank_id_or_name_is_reported_unscheduled(empty_campus):
+    result = timetable_service.solve_timetable([
+        {"course_id": "", "course_name": "Nameless", "expected_enrollment": 10},
+        {"course_id": "CS102", "course_name": "  ", "expected_enrollment": 10},
+        {"course_id": "CS101", "course_name": "Intro", "expected_enrollment": 10}
+    ])
+    assert [c["course_id"] for c in result["scheduled"]] == ["CS101"]
+    assert {u["course_id"]: u["reason"] for u in result["unscheduled"]} == {
+        "": "Empty field: course_id",
+        "CS102": "Empty field: course_name"
+    }